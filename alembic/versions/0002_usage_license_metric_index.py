@@ -0,0 +1,33 @@
+"""Composite (license_id, metric) index on usage_records
+
+Revision ID: 0002_usage_license_metric_index
+Revises: 0001_initial_schema
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0002_usage_license_metric_index"
+down_revision: Union[str, None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_exists(table: str, name: str) -> bool:
+    """Check if an index already exists (handles create_all before migrate)."""
+    from sqlalchemy import inspect as sa_inspect
+    conn = op.get_bind()
+    return name in {ix["name"] for ix in sa_inspect(conn).get_indexes(table)}
+
+
+def upgrade() -> None:
+    if not _index_exists("usage_records", "ix_usage_records_license_metric"):
+        op.create_index(
+            "ix_usage_records_license_metric",
+            "usage_records",
+            ["license_id", "metric"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usage_records_license_metric", table_name="usage_records")
@@ -4,10 +4,18 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from vinzy_engine.common.config import get_settings
 from vinzy_engine.common.schemas import HealthResponse
 
+try:
+    import orjson  # noqa: F401
+except ImportError:  # pragma: no cover - optional "speedups" extra
+    _default_response_class = JSONResponse
+else:
+    _default_response_class = ORJSONResponse
+
 
 def create_app() -> FastAPI:
     settings = get_settings()
@@ -15,18 +23,20 @@ def create_app() -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         # Startup
-        from vinzy_engine.deps import get_db
+        from vinzy_engine.deps import get_db, get_webhook_service
         db = get_db()
         await db.init()
         await db.create_all()
         yield
         # Shutdown
+        await get_webhook_service().close()
         await db.close()
 
     app = FastAPI(
         title=settings.api_title,
         version=settings.api_version,
         lifespan=lifespan,
+        default_response_class=_default_response_class,
     )
 
     # IP allowlist (must be outermost — evaluated first)
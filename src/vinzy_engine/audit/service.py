@@ -12,6 +12,16 @@ from vinzy_engine.common.config import VinzySettings
 from vinzy_engine.audit.models import AuditEventModel
 
 
+def _signature_matches(keys: tuple[bytes, ...], event_hash: str, signature: str) -> bool:
+    """Check an event signature against each already-encoded keyring key."""
+    message = event_hash.encode()
+    for key in keys:
+        expected = hmac_mod.digest(key, message, "sha256").hex()
+        if hmac_mod.compare_digest(expected, signature):
+            return True
+    return False
+
+
 class AuditService:
     """Immutable, hash-chained event log per license."""
 
@@ -27,8 +37,14 @@ class AuditService:
         event_type: str,
         actor: str = "system",
         detail: dict[str, Any] | None = None,
-    ) -> AuditEventModel:
-        """Append a new event to the license's audit chain."""
+    ) -> AuditEventModel | None:
+        """Append a new event to the license's audit chain.
+
+        Returns None without writing anything when ``audit_chain_mode`` is off.
+        """
+        if self.settings.audit_chain_mode == "off":
+            return None
+
         detail = detail or {}
 
         # Fetch chain head (latest event for this license)
@@ -109,13 +125,14 @@ class AuditService:
         if not events:
             return {"valid": True, "events_checked": 0, "break_at": None}
 
+        keys = self._keyring_bytes()
         prev_hash = None
-        for event in events:
+        for index, event in enumerate(events):
             # Check prev_hash linkage
             if event.prev_hash != prev_hash:
                 return {
                     "valid": False,
-                    "events_checked": events.index(event),
+                    "events_checked": index,
                     "break_at": event.id,
                 }
 
@@ -126,15 +143,15 @@ class AuditService:
             if event.event_hash != expected_hash:
                 return {
                     "valid": False,
-                    "events_checked": events.index(event),
+                    "events_checked": index,
                     "break_at": event.id,
                 }
 
             # Verify HMAC signature against keyring (supports rotated keys)
-            if not self._verify_signature(event.event_hash, event.signature):
+            if not _signature_matches(keys, event.event_hash, event.signature):
                 return {
                     "valid": False,
-                    "events_checked": events.index(event),
+                    "events_checked": index,
                     "break_at": event.id,
                 }
 
@@ -172,12 +189,6 @@ class AuditService:
             hashlib.sha256,
         ).hexdigest()
 
-    def _verify_signature(self, event_hash: str, signature: str) -> bool:
-        """Verify signature against all keys in the keyring."""
-        for _version, key in self.settings.hmac_keyring.items():
-            expected = hmac_mod.new(
-                key.encode(), event_hash.encode(), hashlib.sha256,
-            ).hexdigest()
-            if hmac_mod.compare_digest(expected, signature):
-                return True
-        return False
+    def _keyring_bytes(self) -> tuple[bytes, ...]:
+        """Encoded keyring keys, resolved once per verification pass."""
+        return tuple(key.encode() for key in self.settings.hmac_keyring.values())
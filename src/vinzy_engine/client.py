@@ -460,7 +460,8 @@ class LicenseClient:
         """Verify an incoming webhook's HMAC-SHA256 signature.
 
         Args:
-            payload_body: The raw request body (string or bytes).
+            payload_body: The raw request body (string or bytes), exactly
+                as received. Re-serializing parsed JSON will not match.
             signature: The value of the X-Vinzy-Signature header.
             secret: The webhook endpoint's shared secret.
 
@@ -3,6 +3,7 @@
 import json
 import warnings
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,6 +29,11 @@ class VinzySettings(BaseSettings):
 
     # Database
     db_url: str = "sqlite+aiosqlite:///./data/vinzy.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 3600  # seconds
 
     # API
     api_title: str = "Vinzy-Engine"
@@ -59,6 +65,16 @@ class VinzySettings(BaseSettings):
     lease_ttl: int = 86400  # 24 hours
     lease_offline_ttl: int = 259200  # 72 hours
 
+    # Audit chain: "off" skips event recording entirely (development/tests only)
+    audit_chain_mode: Literal["full", "off"] = "full"
+
+    # Webhook delivery HTTP pool
+    webhook_max_connections: int = 200
+    webhook_max_keepalive_connections: int = 100
+    webhook_keepalive_expiry: float = 30.0  # seconds
+    webhook_concurrency: int = 64  # max in-flight deliveries
+    webhook_queue_size: int = 10_000  # pending deliveries; overflow is marked failed (manual retry)
+
     # Pagination
     default_page_size: int = 20
     max_page_size: int = 100
@@ -111,6 +127,11 @@ class VinzySettings(BaseSettings):
                 "Generate secrets with: python -c \"import secrets; print(secrets.token_urlsafe(48))\""
             )
 
+        if self.environment != "development" and self.audit_chain_mode == "off":
+            raise RuntimeError(
+                f"VINZY_AUDIT_CHAIN_MODE=off is not allowed in '{self.environment}' environment."
+            )
+
         if insecure_fields:
             warnings.warn(
                 "Using insecure default keys — set VINZY_SECRET_KEY, VINZY_HMAC_KEY, "
@@ -1,8 +1,9 @@
 """Async database manager for Vinzy-Engine (single-DB)."""
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -23,6 +24,27 @@ import vinzy_engine.anomaly.models  # noqa: F401
 import vinzy_engine.webhooks.models  # noqa: F401
 
 
+def _engine_kwargs(settings: VinzySettings) -> dict[str, Any]:
+    """Build connection-pool options for create_async_engine().
+
+    In-memory SQLite runs on a single static connection, so only the
+    liveness options apply there; every other backend gets a sized pool.
+    """
+    kwargs: dict[str, Any] = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    url = make_url(settings.db_url)
+    in_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+    if not in_memory:
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return kwargs
+
+
 class DatabaseManager:
     """Manages a single async database engine."""
 
@@ -33,7 +55,7 @@ class DatabaseManager:
 
     async def init(self) -> None:
         url = self._settings.db_url
-        self.engine = create_async_engine(url, echo=False)
+        self.engine = create_async_engine(url, echo=False, **_engine_kwargs(self._settings))
         self._session_factory = async_sessionmaker(
             self.engine, expire_on_commit=False
         )
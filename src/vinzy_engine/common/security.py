@@ -1,7 +1,10 @@
 """API key authentication dependencies."""
 
+import hashlib
+import hmac
 import ipaddress
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import Header, HTTPException, Request
@@ -14,6 +17,39 @@ class TenantContext:
     tenant_slug: Optional[str] = None
 
 
+def _key_digest(key: str) -> bytes:
+    """Fixed-length BLAKE2b digest of an API key."""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=32).digest()
+
+
+_LOOPBACK_NETWORKS = (
+    ipaddress.ip_network("127.0.0.1/32"),
+    ipaddress.ip_network("::1/128"),
+)
+
+
+@lru_cache(maxsize=16)
+def _allowlist_networks(
+    entries: tuple[str, ...],
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    """Parse admin allowlist entries once per distinct allowlist.
+
+    Entries that are not valid networks are skipped.
+    """
+    networks = []
+    for entry in entries:
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            continue
+    return tuple(networks)
+
+
+def _key_matches(presented: str, expected: str) -> bool:
+    """Constant-time API key comparison over fixed-length digests."""
+    return hmac.compare_digest(_key_digest(presented), _key_digest(expected))
+
+
 async def require_api_key(
     x_vinzy_api_key: str = Header(..., alias="X-Vinzy-Api-Key"),
 ) -> str:
@@ -21,7 +57,7 @@ async def require_api_key(
     from vinzy_engine.common.config import get_settings
 
     settings = get_settings()
-    if x_vinzy_api_key != settings.api_key:
+    if not _key_matches(x_vinzy_api_key, settings.api_key):
         raise HTTPException(status_code=403, detail="Invalid API key")
     return x_vinzy_api_key
 
@@ -33,7 +69,7 @@ async def require_super_admin(
     from vinzy_engine.common.config import get_settings
 
     settings = get_settings()
-    if x_vinzy_api_key != settings.super_admin_key:
+    if not _key_matches(x_vinzy_api_key, settings.super_admin_key):
         raise HTTPException(status_code=403, detail="Invalid super-admin key")
     return x_vinzy_api_key
 
@@ -58,15 +94,11 @@ async def require_admin_ip(request: Request) -> str:
         raise HTTPException(status_code=403, detail="Invalid client IP")
 
     # Always allow localhost
-    if addr in ipaddress.ip_network("127.0.0.1/32") or addr in ipaddress.ip_network("::1/128"):
+    if any(addr in net for net in _LOOPBACK_NETWORKS):
         return client_ip
 
-    for entry in allowlist:
-        try:
-            if addr in ipaddress.ip_network(entry, strict=False):
-                return client_ip
-        except ValueError:
-            continue
+    if any(addr in net for net in _allowlist_networks(tuple(allowlist))):
+        return client_ip
 
     raise HTTPException(status_code=403, detail=f"IP {client_ip} not in admin allowlist")
 
@@ -288,14 +288,12 @@ def create_dashboard_app() -> FastAPI:
             items, total = await svc.list_licenses(
                 session, status=status, offset=offset, limit=page_size,
             )
-            # Resolve product codes
-            from vinzy_engine.licensing.models import ProductModel
+            # Product codes come from the eager-loaded relationship
             licenses = []
             for lic in items:
-                product = await session.get(ProductModel, lic.product_id)
                 licenses.append({
                     "obj": lic,
-                    "product_code": product.code if product else "",
+                    "product_code": lic.product.code if lic.product else "",
                 })
 
             products = await svc.list_products(session)
@@ -329,13 +327,11 @@ def create_dashboard_app() -> FastAPI:
             items, total = await svc.list_licenses(
                 session, status=status, offset=offset, limit=page_size,
             )
-            from vinzy_engine.licensing.models import ProductModel
             licenses = []
             for lic in items:
-                product = await session.get(ProductModel, lic.product_id)
                 licenses.append({
                     "obj": lic,
-                    "product_code": product.code if product else "",
+                    "product_code": lic.product.code if lic.product else "",
                 })
 
         total_pages = max(1, (total + page_size - 1) // page_size)
@@ -374,13 +370,11 @@ def create_dashboard_app() -> FastAPI:
         # Reload table
         async with db.get_session() as session:
             items, total = await svc.list_licenses(session, limit=20)
-            from vinzy_engine.licensing.models import ProductModel
             licenses = []
             for lic in items:
-                product = await session.get(ProductModel, lic.product_id)
                 licenses.append({
                     "obj": lic,
-                    "product_code": product.code if product else "",
+                    "product_code": lic.product.code if lic.product else "",
                 })
 
         total_pages = max(1, (total + 19) // 20)
@@ -58,10 +58,16 @@ def extract_version(key: str) -> int:
     return _decode_version(parts[1][0])
 
 
+def hmac_for(hmac_key: str) -> "hmac.HMAC":
+    """Fresh HMAC-SHA256 object keyed with ``hmac_key``, ready for update()."""
+    return hmac.new(hmac_key.encode(), digestmod=hashlib.sha256)
+
+
 def _compute_hmac(product_prefix: str, random_part: str, hmac_key: str) -> str:
     """Compute HMAC-SHA256 over prefix+random, return 10-char base32 truncation."""
-    message = f"{product_prefix}-{random_part}".encode()
-    digest = hmac.new(hmac_key.encode(), message, hashlib.sha256).digest()
+    mac = hmac_for(hmac_key)
+    mac.update(f"{product_prefix}-{random_part}".encode())
+    digest = mac.digest()
     b32 = base64.b32encode(digest).decode("ascii").rstrip("=")
     return b32[:SEGMENT_LEN * HMAC_SEGMENTS]
 
@@ -5,13 +5,14 @@ Clients receive it from /validate and can verify it offline without
 contacting the server, providing graceful degradation during outages.
 """
 
-import hashlib
 import hmac
 import json
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from vinzy_engine.keygen.generator import hmac_for
+
 
 @dataclass
 class LeasePayload:
@@ -27,6 +28,18 @@ class LeasePayload:
     expires_at: str  # ISO format
 
 
+def _now() -> datetime:
+    """Current UTC time; tests patch this to move the clock."""
+    return datetime.now(timezone.utc)
+
+
+def _sign(message: bytes, hmac_key: str) -> str:
+    """Hex HMAC-SHA256 of message."""
+    mac = hmac_for(hmac_key)
+    mac.update(message)
+    return mac.hexdigest()
+
+
 def create_lease(
     payload: LeasePayload,
     hmac_key: str,
@@ -42,7 +55,7 @@ def create_lease(
     Returns:
         Dict with 'payload', 'signature', 'lease_expires_at' fields
     """
-    now = datetime.now(timezone.utc)
+    now = _now()
     lease_expires = datetime(
         now.year, now.month, now.day, now.hour, now.minute, now.second,
         tzinfo=timezone.utc,
@@ -56,9 +69,7 @@ def create_lease(
 
     # Include expiry in the signed message
     message = f"{canonical}|{lease_expires.isoformat()}".encode()
-    signature = hmac.new(
-        hmac_key.encode(), message, hashlib.sha256
-    ).hexdigest()
+    signature = _sign(message, hmac_key)
 
     return {
         "payload": payload_dict,
@@ -87,9 +98,7 @@ def verify_lease(lease: dict[str, Any], hmac_key: str) -> bool:
     # Reconstruct canonical message
     canonical = json.dumps(payload_dict, sort_keys=True, separators=(",", ":"))
     message = f"{canonical}|{lease_expires_str}".encode()
-    expected_sig = hmac.new(
-        hmac_key.encode(), message, hashlib.sha256
-    ).hexdigest()
+    expected_sig = _sign(message, hmac_key)
 
     if not hmac.compare_digest(signature, expected_sig):
         return False
@@ -102,5 +111,5 @@ def verify_lease(lease: dict[str, Any], hmac_key: str) -> bool:
     except (ValueError, TypeError):
         return False
 
-    now = datetime.now(timezone.utc)
+    now = _now()
     return now < lease_expires
@@ -20,6 +20,10 @@ from vinzy_engine.keygen.generator import (
 EXPECTED_PARTS = 1 + RANDOM_SEGMENTS + HMAC_SEGMENTS
 BASE32_PATTERN = re.compile(f"^[{BASE32_ALPHABET}]{{{SEGMENT_LEN}}}$")
 PREFIX_PATTERN = re.compile(f"^[A-Z]{{{PREFIX_LEN}}}$")
+# Whole-key shape in one match; the per-part patterns only explain failures
+KEY_PATTERN = re.compile(
+    f"[A-Z]{{{PREFIX_LEN}}}(?:-[{BASE32_ALPHABET}]{{{SEGMENT_LEN}}}){{{EXPECTED_PARTS - 1}}}"
+)
 
 
 class ValidationResult:
@@ -55,6 +59,9 @@ def validate_format(key: str) -> ValidationResult:
     if not key or not isinstance(key, str):
         return ValidationResult(False, "INVALID_FORMAT", "Key is empty or not a string")
 
+    if KEY_PATTERN.fullmatch(key):
+        return ValidationResult(True, "FORMAT_OK", "Key format is valid", key[:PREFIX_LEN])
+
     parts = key.split("-")
     if len(parts) != EXPECTED_PARTS:
         return ValidationResult(
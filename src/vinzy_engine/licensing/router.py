@@ -178,12 +178,10 @@ async def list_licenses(
         )
         result = []
         for lic in items:
-            from vinzy_engine.licensing.models import ProductModel
-            product = await session.get(ProductModel, lic.product_id)
             result.append(LicenseSummary(
                 id=lic.id,
                 status=lic.status,
-                product_code=product.code if product else "",
+                product_code=lic.product.code if lic.product else "",
                 customer_id=lic.customer_id,
                 tier=lic.tier,
                 machines_used=lic.machines_used,
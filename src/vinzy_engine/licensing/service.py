@@ -5,6 +5,7 @@ from typing import Any, Optional
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from vinzy_engine.common.config import VinzySettings
 from vinzy_engine.common.exceptions import (
@@ -267,8 +268,14 @@ class LicensingService:
         )
         total = count_result.scalar() or 0
 
-        # Fetch page
-        query = select(LicenseModel).where(*base_filter).offset(offset).limit(limit)
+        # Fetch page, with each license's product loaded in one extra query
+        query = (
+            select(LicenseModel)
+            .options(selectinload(LicenseModel.product))
+            .where(*base_filter)
+            .offset(offset)
+            .limit(limit)
+        )
         result = await session.execute(query)
         items = list(result.scalars().all())
 
@@ -504,7 +511,9 @@ class LicensingService:
         """Compose entitlements across all active licenses for a customer."""
         from vinzy_engine.licensing.composition import compose_customer_entitlements
 
-        query = select(LicenseModel).where(
+        query = select(LicenseModel).options(
+            selectinload(LicenseModel.product),
+        ).where(
             LicenseModel.customer_id == customer_id,
             LicenseModel.status == "active",
             LicenseModel.is_deleted == False,
@@ -517,13 +526,10 @@ class LicensingService:
         result = await session.execute(query)
         licenses = list(result.scalars().all())
 
-        # Load all referenced products
-        product_ids = {lic.product_id for lic in licenses}
-        products = []
-        for pid in product_ids:
-            p = await session.get(ProductModel, pid)
-            if p:
-                products.append(p)
+        # Products arrive with the licenses (one SELECT ... IN for all of them)
+        products = list({
+            lic.product_id: lic.product for lic in licenses if lic.product is not None
+        }.values())
 
         composed = compose_customer_entitlements(licenses, products)
 
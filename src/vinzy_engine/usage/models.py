@@ -1,6 +1,6 @@
 """SQLAlchemy models for usage tracking."""
 
-from sqlalchemy import Float, ForeignKey, JSON, String
+from sqlalchemy import Float, ForeignKey, Index, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from vinzy_engine.common.models import Base, TimestampMixin, generate_uuid
@@ -8,6 +8,10 @@ from vinzy_engine.common.models import Base, TimestampMixin, generate_uuid
 
 class UsageRecordModel(Base, TimestampMixin):
     __tablename__ = "usage_records"
+    __table_args__ = (
+        # Running totals are SUM(value) per (license, metric); keep that a range scan
+        Index("ix_usage_records_license_metric", "license_id", "metric"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     license_id: Mapped[str] = mapped_column(
@@ -5,7 +5,13 @@ from fastapi import APIRouter, Depends, Request
 from vinzy_engine.common.exceptions import VinzyError
 from vinzy_engine.common.security import require_api_key, require_admin_ip
 from vinzy_engine.common.rate_limiting import limiter, _public_limit, _admin_limit
-from vinzy_engine.usage.schemas import UsageRecordRequest, UsageRecordResponse, UsageSummary
+from vinzy_engine.usage.schemas import (
+    UsageBatchRequest,
+    UsageBatchResponse,
+    UsageRecordRequest,
+    UsageRecordResponse,
+    UsageSummary,
+)
 
 router = APIRouter()
 
@@ -42,6 +48,23 @@ async def record_usage(request: Request, body: UsageRecordRequest):
         )
 
 
+@router.post("/usage/record_batch", response_model=UsageBatchResponse)
+@limiter.limit(_public_limit)
+async def record_usage_batch(request: Request, body: UsageBatchRequest):
+    svc = _get_service()
+    db = _get_db()
+    try:
+        async with db.get_session() as session:
+            results = await svc.record_usage_batch(
+                session,
+                raw_key=body.key,
+                records=[r.model_dump() for r in body.records],
+            )
+            return UsageBatchResponse(success=True, results=results, code="RECORDED")
+    except VinzyError as e:
+        return UsageBatchResponse(success=False, code=e.code)
+
+
 @router.get("/usage/{license_id}", response_model=list[UsageSummary])
 @limiter.limit(_admin_limit)
 async def get_usage(request: Request, license_id: str, _=Depends(require_api_key), __=Depends(require_admin_ip)):
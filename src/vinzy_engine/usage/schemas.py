@@ -22,6 +22,23 @@ class UsageRecordResponse(BaseModel):
     code: str = ""
 
 
+class UsageBatchItem(BaseModel):
+    metric: str = Field(..., min_length=1, max_length=255)
+    value: float = Field(default=1.0, gt=0)
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class UsageBatchRequest(BaseModel):
+    key: str
+    records: list[UsageBatchItem] = Field(..., min_length=1, max_length=100)
+
+
+class UsageBatchResponse(BaseModel):
+    success: bool
+    results: list[UsageRecordResponse] = []
+    code: str = ""
+
+
 class UsageSummary(BaseModel):
     metric: str
     total_value: float
@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from datetime import datetime, timezone
@@ -28,15 +28,10 @@ class UsageService:
         self.anomaly_service = anomaly_service
         self.webhook_service = webhook_service
 
-    async def record_usage(
-        self,
-        session: AsyncSession,
-        raw_key: str,
-        metric: str,
-        value: float = 1.0,
-        metadata: dict[str, Any] | None = None,
-    ) -> dict:
-        """Record a usage event for a licensed metric."""
+    async def _get_active_license(
+        self, session: AsyncSession, raw_key: str,
+    ) -> LicenseModel:
+        """Resolve a raw key to a license that may still accrue usage."""
         license_obj = await self.licensing.get_license_by_key(session, raw_key)
         if license_obj is None:
             raise LicenseNotFoundError()
@@ -52,6 +47,123 @@ class UsageService:
                 expires = expires.replace(tzinfo=timezone.utc)
             if expires < datetime.now(timezone.utc):
                 raise LicenseExpiredError()
+        return license_obj
+
+    async def _usage_totals(
+        self, session: AsyncSession, license_obj: LicenseModel, metric: str,
+    ) -> tuple[float, float | None, float | None]:
+        """Return (total_value, limit, remaining) for a license metric."""
+        totals = await self._usage_totals_many(session, license_obj, [metric])
+        return totals[metric]
+
+    async def _usage_totals_many(
+        self, session: AsyncSession, license_obj: LicenseModel, metrics: list[str],
+    ) -> dict[str, tuple[float, float | None, float | None]]:
+        """(total_value, limit, remaining) per metric, from one grouped query."""
+        result = await session.execute(
+            select(UsageRecordModel.metric, func.sum(UsageRecordModel.value))
+            .where(
+                UsageRecordModel.license_id == license_obj.id,
+                UsageRecordModel.metric.in_(metrics),
+            )
+            .group_by(UsageRecordModel.metric)
+        )
+        sums = {metric: total for metric, total in result.all()}
+
+        # Check entitlement limits
+        entitlements = license_obj.entitlements or {}
+        totals = {}
+        for metric in metrics:
+            total_value = sums.get(metric) or 0.0
+            limit = None
+            remaining = None
+            if metric in entitlements:
+                ent = entitlements[metric]
+                if isinstance(ent, dict):
+                    limit = ent.get("limit")
+                if limit is not None:
+                    remaining = max(0.0, limit - total_value)
+            totals[metric] = (total_value, limit, remaining)
+        return totals
+
+    async def _record_grouped(
+        self,
+        session: AsyncSession,
+        license_obj: LicenseModel,
+        by_metric: dict[str, list[tuple[float, dict[str, Any]]]],
+    ) -> list[dict]:
+        """Insert ``(value, metadata)`` rows for each metric in one statement.
+
+        The anomaly scan runs once per metric against its smallest and
+        largest value, the only candidates for the most extreme z-score.
+        Each metric gets one ``usage.recorded_batch`` audit event and
+        webhook carrying the row count and summed value. Returns one result
+        per metric in ``by_metric`` order.
+        """
+        if self.anomaly_service:
+            for metric, rows in by_metric.items():
+                if not rows:
+                    continue
+                values = [v for v, _ in rows]
+                for value in sorted({min(values), max(values)}):
+                    await self.anomaly_service.scan_and_record(
+                        session, license_obj.id, metric, value,
+                    )
+
+        params = [
+            {
+                "license_id": license_obj.id,
+                "metric": metric,
+                "value": value,
+                "metadata_": metadata,
+            }
+            for metric, rows in by_metric.items()
+            for value, metadata in rows
+        ]
+        if params:
+            await session.execute(insert(UsageRecordModel), params)
+
+        totals = await self._usage_totals_many(session, license_obj, list(by_metric))
+        results = []
+        for metric, rows in by_metric.items():
+            value_added = float(sum(v for v, _ in rows))
+            if rows and self.audit_service:
+                await self.audit_service.record_event(
+                    session, license_obj.id, "usage.recorded_batch", "system",
+                    {"metric": metric, "count": len(rows), "sum": value_added},
+                )
+            if rows and self.webhook_service:
+                await self.webhook_service.dispatch(
+                    session, "usage.recorded_batch",
+                    {
+                        "license_id": license_obj.id,
+                        "metric": metric,
+                        "count": len(rows),
+                        "sum": value_added,
+                    },
+                )
+            total_value, limit, remaining = totals[metric]
+            results.append({
+                "success": True,
+                "metric": metric,
+                "value_added": value_added,
+                "total_value": total_value,
+                "limit": limit,
+                "remaining": remaining,
+                "code": "RECORDED",
+            })
+        return results
+
+    async def record_usage(
+        self,
+        session: AsyncSession,
+        raw_key: str,
+        metric: str,
+        value: float = 1.0,
+        metadata: dict[str, Any] | None = None,
+    ) -> dict:
+        """Record a usage event for a licensed metric."""
+        license_obj = await self._get_active_license(session, raw_key)
 
         # Anomaly scan — run BEFORE inserting usage so history reflects prior behavior only
         if self.anomaly_service:
@@ -69,25 +181,9 @@ class UsageService:
         session.add(record)
         await session.flush()
 
-        # Calculate total for this metric
-        total_result = await session.execute(
-            select(func.sum(UsageRecordModel.value)).where(
-                UsageRecordModel.license_id == license_obj.id,
-                UsageRecordModel.metric == metric,
-            )
+        total_value, limit, remaining = await self._usage_totals(
+            session, license_obj, metric,
         )
-        total_value = total_result.scalar() or 0.0
-
-        # Check entitlement limits
-        entitlements = license_obj.entitlements or {}
-        limit = None
-        remaining = None
-        if metric in entitlements:
-            ent = entitlements[metric]
-            if isinstance(ent, dict):
-                limit = ent.get("limit")
-            if limit is not None:
-                remaining = max(0.0, limit - total_value)
 
         # Audit: usage.recorded
         if self.audit_service:
@@ -113,6 +209,45 @@ class UsageService:
             "code": "RECORDED",
         }
 
+    async def record_usage_many(
+        self,
+        session: AsyncSession,
+        raw_key: str,
+        metric: str,
+        values: list[float],
+        metadata: dict[str, Any] | None = None,
+    ) -> dict:
+        """Record several usage events for one metric in a single INSERT.
+
+        The license is resolved once and all rows go out in one statement.
+        The anomaly scan checks the batch's smallest and largest values, and
+        a single ``usage.recorded_batch`` audit event / webhook covers it.
+        """
+        license_obj = await self._get_active_license(session, raw_key)
+        rows = [(value, metadata or {}) for value in values]
+        results = await self._record_grouped(session, license_obj, {metric: rows})
+        return results[0]
+
+    async def record_usage_batch(
+        self,
+        session: AsyncSession,
+        raw_key: str,
+        records: list[dict[str, Any]],
+    ) -> list[dict]:
+        """Record usage for several metrics of one license in a single INSERT.
+
+        ``records`` are dicts with ``metric``, ``value`` and optional
+        ``metadata``. Returns one result per distinct metric, in the order
+        each metric first appears.
+        """
+        license_obj = await self._get_active_license(session, raw_key)
+        by_metric: dict[str, list[tuple[float, dict[str, Any]]]] = {}
+        for record in records:
+            by_metric.setdefault(record["metric"], []).append(
+                (record["value"], record.get("metadata") or {}),
+            )
+        return await self._record_grouped(session, license_obj, by_metric)
+
     async def get_usage_summary(
         self,
         session: AsyncSession,
@@ -1,7 +1,5 @@
 """Webhook management API router."""
 
-from datetime import datetime, timezone
-
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import Response
 
@@ -12,10 +10,9 @@ from vinzy_engine.webhooks.schemas import (
     WebhookEndpointCreate,
     WebhookEndpointResponse,
     WebhookEndpointUpdate,
-    WebhookTestRequest,
 )
 from vinzy_engine.webhooks.models import WebhookDeliveryModel
-from vinzy_engine.webhooks.service import VALID_EVENT_TYPES
+from vinzy_engine.webhooks.service import build_envelope, encode_payload
 
 router = APIRouter()
 
@@ -31,34 +28,11 @@ def _get_db():
 
 
 def _endpoint_to_response(ep) -> WebhookEndpointResponse:
-    return WebhookEndpointResponse(
-        id=ep.id,
-        tenant_id=ep.tenant_id,
-        url=ep.url,
-        description=ep.description,
-        event_types=ep.event_types or [],
-        status=ep.status,
-        max_retries=ep.max_retries,
-        timeout_seconds=ep.timeout_seconds,
-        created_at=ep.created_at,
-        updated_at=ep.updated_at,
-    )
+    return WebhookEndpointResponse.model_validate(ep)
 
 
 def _delivery_to_response(d) -> WebhookDeliveryResponse:
-    return WebhookDeliveryResponse(
-        id=d.id,
-        endpoint_id=d.endpoint_id,
-        event_type=d.event_type,
-        payload=d.payload or {},
-        status=d.status,
-        attempts=d.attempts,
-        last_response_code=d.last_response_code,
-        last_error=d.last_error,
-        next_retry_at=d.next_retry_at,
-        created_at=d.created_at,
-        updated_at=d.updated_at,
-    )
+    return WebhookDeliveryResponse.model_validate(d)
 
 
 @router.post("/webhooks", response_model=WebhookEndpointResponse, status_code=201)
@@ -69,20 +43,12 @@ async def create_webhook_endpoint(
     _=Depends(require_api_key),
     __=Depends(require_admin_ip),
 ):
-    # Validate event types
-    for et in body.event_types:
-        if et not in VALID_EVENT_TYPES:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Invalid event type: {et}. Valid types: {sorted(VALID_EVENT_TYPES)}",
-            )
-
     svc = _get_service()
     db = _get_db()
     async with db.get_session() as session:
         ep = await svc.create_endpoint(
             session,
-            url=body.url,
+            url=str(body.url),
             secret=body.secret,
             event_types=body.event_types,
             description=body.description,
@@ -133,18 +99,9 @@ async def update_webhook_endpoint(
     _=Depends(require_api_key),
     __=Depends(require_admin_ip),
 ):
-    # Validate event types if provided
-    if body.event_types is not None:
-        for et in body.event_types:
-            if et not in VALID_EVENT_TYPES:
-                raise HTTPException(
-                    status_code=422,
-                    detail=f"Invalid event type: {et}. Valid types: {sorted(VALID_EVENT_TYPES)}",
-                )
-
     svc = _get_service()
     db = _get_db()
-    updates = body.model_dump(exclude_none=True)
+    updates = body.model_dump(mode="json", exclude_none=True)
     async with db.get_session() as session:
         ep = await svc.update_endpoint(session, endpoint_id, **updates)
         if ep is None:
@@ -207,7 +164,6 @@ async def list_endpoint_deliveries(
 async def test_webhook_endpoint(
     request: Request,
     endpoint_id: str,
-    body: WebhookTestRequest | None = None,
     _=Depends(require_api_key),
     __=Depends(require_admin_ip),
 ):
@@ -218,11 +174,9 @@ async def test_webhook_endpoint(
         if ep is None:
             raise HTTPException(status_code=404, detail="Webhook endpoint not found")
 
-        test_payload = {
-            "event_type": "webhook.test",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data": {"message": "Test ping from Vinzy-Engine"},
-        }
+        test_payload = build_envelope(
+            "webhook.test", {"message": "Test ping from Vinzy-Engine"},
+        )
         delivery = WebhookDeliveryModel(
             endpoint_id=ep.id,
             event_type="webhook.test",
@@ -232,17 +186,9 @@ async def test_webhook_endpoint(
         session.add(delivery)
         await session.flush()
 
-        import asyncio
-        asyncio.create_task(
-            svc._send_delivery(
-                delivery_id=delivery.id,
-                url=ep.url,
-                secret=ep.secret,
-                payload=test_payload,
-                max_retries=ep.max_retries,
-                timeout=ep.timeout_seconds,
-            )
-        )
+        svc._send_after_commit(session, [
+            svc._delivery_job(delivery, ep, encode_payload(test_payload)),
+        ])
         return _delivery_to_response(delivery)
 
 
@@ -1,24 +1,36 @@
 """Pydantic schemas for webhook API endpoints."""
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, HttpUrl, field_validator
+
+WebhookEventType = Literal[
+    "license.created",
+    "license.updated",
+    "license.deleted",
+    "license.validated",
+    "activation.created",
+    "activation.removed",
+    "usage.recorded",
+    "usage.recorded_batch",
+    "anomaly.detected",
+]
 
 
 class WebhookEndpointCreate(BaseModel):
-    url: str
+    url: HttpUrl
     secret: str = Field(..., min_length=16)
-    event_types: list[str] = []
+    event_types: list[WebhookEventType] = []
     description: str = ""
     max_retries: int = Field(3, ge=0, le=10)
     timeout_seconds: int = Field(10, ge=1, le=60)
 
 
 class WebhookEndpointUpdate(BaseModel):
-    url: Optional[str] = None
+    url: Optional[HttpUrl] = None
     secret: Optional[str] = Field(None, min_length=16)
-    event_types: Optional[list[str]] = None
+    event_types: Optional[list[WebhookEventType]] = None
     description: Optional[str] = None
     max_retries: Optional[int] = Field(None, ge=0, le=10)
     timeout_seconds: Optional[int] = Field(None, ge=1, le=60)
@@ -39,6 +51,12 @@ class WebhookEndpointResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("event_types", mode="before")
+    @classmethod
+    def _null_event_types(cls, value: Any) -> Any:
+        # A JSON null in the column loads as None; like [], it means "all events".
+        return [] if value is None else value
+
 
 class WebhookDeliveryResponse(BaseModel):
     id: str
@@ -55,6 +73,7 @@ class WebhookDeliveryResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
-
-class WebhookTestRequest(BaseModel):
-    pass
+    @field_validator("payload", mode="before")
+    @classmethod
+    def _null_payload(cls, value: Any) -> Any:
+        return {} if value is None else value
@@ -1,40 +1,102 @@
 """Webhook service — CRUD, dispatch, and delivery management."""
 
 import asyncio
-import hashlib
 import hmac
 import json
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Optional, get_args
 
-from sqlalchemy import select
+import httpx
+from sqlalchemy import cast, event, exists, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from vinzy_engine.common.config import VinzySettings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 from vinzy_engine.webhooks.models import WebhookDeliveryModel, WebhookEndpointModel
+from vinzy_engine.webhooks.schemas import WebhookEventType
 
 logger = logging.getLogger(__name__)
 
-VALID_EVENT_TYPES: frozenset[str] = frozenset({
-    "license.created",
-    "license.updated",
-    "license.deleted",
-    "license.validated",
-    "activation.created",
-    "activation.removed",
-    "usage.recorded",
-    "anomaly.detected",
-})
+# Delivery status updates are buffered and written in batches.
+_STATUS_FLUSH_INTERVAL = 0.2  # seconds
+_STATUS_BATCH_SIZE = 500
+
+# 4xx responses are terminal except these, which signal "try again later".
+_RETRYABLE_CLIENT_STATUSES = frozenset({408, 425, 429})
+# Request errors that no amount of retrying will fix.
+_TERMINAL_ERRORS = (httpx.InvalidURL, httpx.UnsupportedProtocol, httpx.LocalProtocolError)
+
+VALID_EVENT_TYPES: frozenset[str] = frozenset(get_args(WebhookEventType))
+
 
+def encode_payload(payload: dict[str, Any]) -> bytes:
+    """Serialize a webhook envelope to the exact bytes that are signed and sent.
+
+    Uses orjson when installed (``pip install vinzy-engine[speedups]``),
+    otherwise — or for payloads orjson rejects, such as integers wider than
+    64 bits — the stdlib encoder. The two differ in whitespace and datetime
+    formatting, so receivers must verify the signature over the raw body.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                payload, default=str,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:  # orjson.JSONEncodeError
+            pass
+    return json.dumps(payload, default=str).encode("utf-8")
 
-def sign_payload(payload_json: str, secret: str) -> str:
+
+def build_envelope(event_type: str, data: dict[str, Any]) -> dict[str, Any]:
+    """Wrap event data in the standard webhook envelope."""
+    return {
+        "event_type": event_type,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "data": data,
+    }
+
+
+def sign_payload(payload: bytes | str, secret: str) -> str:
     """Compute HMAC-SHA256 hex digest for a JSON payload."""
-    return hmac.new(
-        secret.encode("utf-8"),
-        payload_json.encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    # One-shot OpenSSL HMAC; avoids the pure-Python hmac.HMAC wrapper.
+    return hmac.digest(secret.encode("utf-8"), payload, "sha256").hex()
+
+
+def _subscription_filter(event_type: str, dialect: str):
+    """SQL clause matching endpoints subscribed to ``event_type``.
+
+    An empty list, JSON ``null`` or SQL NULL in ``event_types`` is a
+    wildcard. Returns None for dialects without JSON array support, in
+    which case dispatch filters in Python.
+    """
+    column = WebhookEndpointModel.event_types
+    if dialect == "postgresql":
+        as_jsonb = cast(column, JSONB)
+        # jsonb_array_length() raises on scalars, so compare against '[]'.
+        return or_(
+            column.is_(None),
+            func.jsonb_typeof(as_jsonb) != "array",
+            as_jsonb == cast(literal("[]"), JSONB),
+            as_jsonb.contains([event_type]),
+        )
+    if dialect == "sqlite":
+        subscribed = func.json_each(column).table_valued("value")
+        return or_(
+            column.is_(None),
+            func.json_type(column) != "array",
+            func.json_array_length(column) == 0,
+            exists(select(1).select_from(subscribed).where(subscribed.c.value == event_type)),
+        )
+    return None
 
 
 class WebhookService:
@@ -42,14 +104,133 @@ class WebhookService:
 
     def __init__(self, settings: VinzySettings):
         self.settings = settings
-        self._http_client = None
+        # One pooled client shared by every delivery so keep-alive connections
+        # (and their TLS sessions) are reused across dispatches and retries.
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.webhook_max_connections,
+                max_keepalive_connections=settings.webhook_max_keepalive_connections,
+                keepalive_expiry=settings.webhook_keepalive_expiry,
+            ),
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+        )
+        # Bounded delivery queue drained by at most webhook_concurrency workers.
+        self._queue: asyncio.Queue | None = None
+        self._queue_loop: asyncio.AbstractEventLoop | None = None
+        self._workers: set[asyncio.Task] = set()
+        self._active_workers = 0
+        # Buffered (delivery_id, status, attempts, response_code, error) tuples.
+        self._status_queue: asyncio.Queue | None = None
+        self._status_loop: asyncio.AbstractEventLoop | None = None
+        self._status_drainer: asyncio.Task | None = None
+
+    async def close(self) -> None:
+        """Stop delivery workers, flush status updates, release HTTP connections."""
+        for task in self._workers:
+            task.cancel()
+        self._workers.clear()
+        self._active_workers = 0
+        self._queue = None
+        if self._status_loop is asyncio.get_running_loop():
+            await self._flush_status_updates()
+        self._status_queue = None
+        await self._http_client.aclose()
+
+    # ── Delivery queue ──
+
+    def _get_queue(self) -> asyncio.Queue:
+        """Return the delivery queue bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._queue_loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.settings.webhook_queue_size)
+            self._queue_loop = loop
+            self._workers = set()
+            self._active_workers = 0
+        return self._queue
+
+    def _fan_out(self, jobs: list[dict[str, Any]]) -> None:
+        """Queue committed deliveries without waiting for room.
+
+        Jobs that do not fit in the bounded queue are marked failed rather
+        than held in memory. Nothing re-sends them automatically; they need
+        a manual retry (``POST /webhooks/deliveries/{id}/retry``).
+        """
+        queue = self._get_queue()
+        for job in jobs:
+            try:
+                queue.put_nowait(job)
+            except asyncio.QueueFull:
+                logger.warning(
+                    "Webhook queue full; delivery %s marked failed", job["delivery_id"],
+                )
+                self._queue_status_update(
+                    job["delivery_id"], "failed", 0, None, "delivery queue full",
+                )
+        while (
+            self._active_workers < self.settings.webhook_concurrency
+            and self._active_workers < queue.qsize()
+        ):
+            self._active_workers += 1
+            task = asyncio.create_task(self._delivery_worker(queue))
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+    @staticmethod
+    def _delivery_job(
+        delivery: WebhookDeliveryModel,
+        endpoint: WebhookEndpointModel,
+        payload_bytes: bytes,
+    ) -> dict[str, Any]:
+        """Build the queue job for a flushed delivery row."""
+        return {
+            "delivery_id": delivery.id,
+            "url": endpoint.url,
+            "secret": endpoint.secret,
+            "payload_bytes": payload_bytes,
+            "event_type": delivery.event_type,
+            "max_retries": endpoint.max_retries,
+            "timeout": endpoint.timeout_seconds,
+        }
+
+    def _send_after_commit(self, session: AsyncSession, jobs: list[dict[str, Any]]) -> None:
+        """Queue ``jobs`` once ``session`` commits.
+
+        Sending earlier would race the caller's transaction: status updates
+        could run before the delivery rows exist. On rollback the jobs are
+        dropped along with their rows.
+        """
+        done = False
+
+        def _on_commit(_session) -> None:
+            nonlocal done
+            if done:
+                return
+            done = True
+            self._fan_out(jobs)
 
-    def _get_http_client(self):
-        """Lazy-init httpx.AsyncClient."""
-        if self._http_client is None:
-            import httpx
-            self._http_client = httpx.AsyncClient()
-        return self._http_client
+        def _on_rollback(_session) -> None:
+            nonlocal done
+            done = True
+
+        sync_session = session.sync_session
+        event.listen(sync_session, "after_commit", _on_commit, once=True)
+        event.listen(sync_session, "after_rollback", _on_rollback, once=True)
+
+    async def _delivery_worker(self, queue: asyncio.Queue) -> None:
+        """Send queued deliveries until the queue is drained."""
+        try:
+            while not queue.empty():
+                job = queue.get_nowait()
+                try:
+                    await self._send_delivery(**job)
+                except Exception:
+                    logger.exception("Webhook delivery %s crashed", job.get("delivery_id"))
+                finally:
+                    queue.task_done()
+        finally:
+            if queue is self._queue:
+                self._active_workers -= 1
 
     # ── CRUD ──
 
@@ -143,7 +324,7 @@ class WebhookService:
         payload: dict[str, Any],
         tenant_id: str | None = None,
     ) -> list[WebhookDeliveryModel]:
-        """Create delivery records for matching active endpoints and fire async sends."""
+        """Create delivery records for matching endpoints; send them after commit."""
         query = select(WebhookEndpointModel).where(
             WebhookEndpointModel.status == "active",
         )
@@ -151,43 +332,40 @@ class WebhookService:
             query = query.where(WebhookEndpointModel.tenant_id == tenant_id)
         else:
             query = query.where(WebhookEndpointModel.tenant_id.is_(None))
+        # Let the database drop endpoints that are not subscribed.
+        subscription = _subscription_filter(event_type, session.bind.dialect.name)
+        if subscription is not None:
+            query = query.where(subscription)
 
         result = await session.execute(query)
         endpoints = list(result.scalars().all())
 
-        deliveries = []
-        envelope = {
-            "event_type": event_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data": payload,
-        }
+        envelope = build_envelope(event_type, payload)
+        # Identical for every endpoint — serialize once, sign per endpoint.
+        envelope_bytes = encode_payload(envelope)
 
+        targets: list[tuple[WebhookEndpointModel, WebhookDeliveryModel]] = []
         for ep in endpoints:
-            # Empty event_types = wildcard (match all events)
-            if ep.event_types and event_type not in ep.event_types:
+            # Without a SQL filter, check here; empty event_types = wildcard
+            if subscription is None and ep.event_types and event_type not in ep.event_types:
                 continue
-
-            delivery = WebhookDeliveryModel(
+            targets.append((ep, WebhookDeliveryModel(
                 endpoint_id=ep.id,
                 event_type=event_type,
                 payload=envelope,
                 status="pending",
-            )
-            session.add(delivery)
-            await session.flush()
-
-            # Fire-and-forget async delivery
-            asyncio.create_task(
-                self._send_delivery(
-                    delivery_id=delivery.id,
-                    url=ep.url,
-                    secret=ep.secret,
-                    payload=envelope,
-                    max_retries=ep.max_retries,
-                    timeout=ep.timeout_seconds,
-                )
-            )
-            deliveries.append(delivery)
+            )))
+        if not targets:
+            return []
+
+        # One flush assigns IDs to every delivery in a single round-trip.
+        deliveries = [delivery for _, delivery in targets]
+        session.add_all(deliveries)
+        await session.flush()
+
+        self._send_after_commit(session, [
+            self._delivery_job(delivery, ep, envelope_bytes) for ep, delivery in targets
+        ])
 
         return deliveries
 
@@ -196,19 +374,21 @@ class WebhookService:
         delivery_id: str,
         url: str,
         secret: str,
-        payload: dict[str, Any],
+        payload_bytes: bytes,
+        event_type: str,
         max_retries: int,
         timeout: int,
     ) -> None:
-        """Send HTTP POST with HMAC signature and retry on failure."""
-        import httpx
+        """Send HTTP POST with HMAC signature and retry on failure.
 
-        payload_json = json.dumps(payload, default=str)
-        signature = sign_payload(payload_json, secret)
+        Timeouts, connection errors, 5xx and 408/425/429 are retried with
+        exponential backoff; other 4xx responses and malformed requests
+        fail the delivery immediately.
+        """
         headers = {
             "Content-Type": "application/json",
-            "X-Vinzy-Signature": signature,
-            "X-Vinzy-Event": payload.get("event_type", ""),
+            "X-Vinzy-Signature": sign_payload(payload_bytes, secret),
+            "X-Vinzy-Event": event_type,
         }
 
         last_error = None
@@ -216,10 +396,9 @@ class WebhookService:
 
         for attempt in range(max_retries + 1):
             try:
-                client = self._get_http_client()
-                resp = await client.post(
+                resp = await self._http_client.post(
                     url,
-                    content=payload_json,
+                    content=payload_bytes,
                     headers=headers,
                     timeout=timeout,
                 )
@@ -232,6 +411,19 @@ class WebhookService:
                     return
 
                 last_error = f"HTTP {resp.status_code}"
+                if (
+                    resp.status_code < 500
+                    and resp.status_code not in _RETRYABLE_CLIENT_STATUSES
+                ):
+                    await self._update_delivery_status(
+                        delivery_id, "failed", attempt + 1, last_status, last_error,
+                    )
+                    return
+            except _TERMINAL_ERRORS as e:
+                await self._update_delivery_status(
+                    delivery_id, "failed", attempt + 1, last_status, str(e),
+                )
+                return
             except httpx.TimeoutException:
                 last_error = "timeout"
             except httpx.HTTPError as e:
@@ -255,28 +447,78 @@ class WebhookService:
         response_code: int | None,
         error: str | None,
     ) -> None:
-        """Update delivery record using a fresh DB session."""
+        """Buffer a delivery status change for the batched status writer."""
+        self._queue_status_update(delivery_id, status, attempts, response_code, error)
+
+    def _queue_status_update(
+        self,
+        delivery_id: str,
+        status: str,
+        attempts: int,
+        response_code: int | None,
+        error: str | None,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        if self._status_queue is None or self._status_loop is not loop:
+            self._status_queue = asyncio.Queue()
+            self._status_loop = loop
+            self._status_drainer = None
+        queue = self._status_queue
+        queue.put_nowait((delivery_id, status, attempts, response_code, error))
+        if self._status_drainer is None:
+            self._status_drainer = asyncio.create_task(self._drain_status_updates(queue))
+
+    async def _drain_status_updates(self, queue: asyncio.Queue) -> None:
+        """Collect status updates for a short window, then write them in batches."""
+        try:
+            await asyncio.sleep(_STATUS_FLUSH_INTERVAL)
+            while not queue.empty():
+                batch = [
+                    queue.get_nowait()
+                    for _ in range(min(queue.qsize(), _STATUS_BATCH_SIZE))
+                ]
+                try:
+                    await self._write_status_batch(batch)
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+        finally:
+            if queue is self._status_queue:
+                self._status_drainer = None
+
+    async def _flush_status_updates(self) -> None:
+        """Wait until every buffered status update has been written."""
+        if self._status_queue is not None:
+            await self._status_queue.join()
+
+    async def _write_status_batch(self, batch: list[tuple]) -> None:
+        """Apply buffered status updates with one UPDATE per distinct outcome."""
         from vinzy_engine.deps import get_db
 
+        # Only the most recent update for a delivery matters.
+        latest = {delivery_id: values for delivery_id, *values in batch}
+        groups: dict[tuple, list[str]] = {}
+        for delivery_id, values in latest.items():
+            groups.setdefault(tuple(values), []).append(delivery_id)
+
+        next_retry_at = datetime.now(timezone.utc) + timedelta(minutes=5)
         db = get_db()
         try:
             async with db.get_session() as session:
-                result = await session.execute(
-                    select(WebhookDeliveryModel).where(
-                        WebhookDeliveryModel.id == delivery_id,
+                for (status, attempts, response_code, error), ids in groups.items():
+                    await session.execute(
+                        update(WebhookDeliveryModel)
+                        .where(WebhookDeliveryModel.id.in_(ids))
+                        .values(
+                            status=status,
+                            attempts=attempts,
+                            last_response_code=response_code,
+                            last_error=error,
+                            next_retry_at=next_retry_at if status == "failed" else None,
+                        )
                     )
-                )
-                delivery = result.scalar_one_or_none()
-                if delivery is None:
-                    return
-                delivery.status = status
-                delivery.attempts = attempts
-                delivery.last_response_code = response_code
-                delivery.last_error = error
-                if status == "failed":
-                    delivery.next_retry_at = datetime.now(timezone.utc) + timedelta(minutes=5)
         except Exception:
-            logger.exception("Failed to update delivery %s", delivery_id)
+            logger.exception("Failed to update %d webhook deliveries", len(latest))
 
     # ── Delivery queries ──
 
@@ -314,7 +556,7 @@ class WebhookService:
     async def retry_delivery(
         self, session: AsyncSession, delivery_id: str,
     ) -> Optional[WebhookDeliveryModel]:
-        """Reset a failed delivery to pending and re-fire."""
+        """Reset a failed delivery to pending and re-send it after commit."""
         delivery = await self.get_delivery(session, delivery_id)
         if delivery is None:
             return None
@@ -330,14 +572,7 @@ class WebhookService:
         delivery.next_retry_at = None
         await session.flush()
 
-        asyncio.create_task(
-            self._send_delivery(
-                delivery_id=delivery.id,
-                url=endpoint.url,
-                secret=endpoint.secret,
-                payload=delivery.payload,
-                max_retries=endpoint.max_retries,
-                timeout=endpoint.timeout_seconds,
-            )
-        )
+        self._send_after_commit(session, [
+            self._delivery_job(delivery, endpoint, encode_payload(delivery.payload)),
+        ])
         return delivery
@@ -1,13 +1,30 @@
 """Shared test fixtures for Vinzy-Engine."""
 
 import os
+import sys
+from types import MappingProxyType
+
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 
 HMAC_KEY = "test-hmac-key-for-unit-tests"
 API_KEY = "test-admin-api-key"
 SUPER_ADMIN_KEY = "test-super-admin-key"
+SECRET_KEY = "test-dashboard-secret-key"
+
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+if uvloop is not None and sys.platform != "win32":
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop where it is installed (it does not support Windows)."""
+        return {"uvloop": uvloop.new_event_loop}
 
 
 @pytest.fixture
@@ -20,49 +37,382 @@ def api_key():
     return API_KEY
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
-    """Create a test app with in-memory DB."""
+    """Create the test app once for the whole session."""
     os.environ["VINZY_DB_URL"] = "sqlite+aiosqlite://"
     os.environ["VINZY_HMAC_KEY"] = HMAC_KEY
     os.environ["VINZY_API_KEY"] = API_KEY
     os.environ["VINZY_SUPER_ADMIN_KEY"] = SUPER_ADMIN_KEY
+    os.environ["VINZY_SECRET_KEY"] = SECRET_KEY
 
     # Clear caches and singletons so new env vars take effect
     from vinzy_engine.common.config import get_settings
     get_settings.cache_clear()
+    # Skip audit-chain hashing unless a test opts back in (see ``audit_chain``).
+    # Set on the shared settings object rather than the environment so unit
+    # tests building their own VinzySettings keep the default.
+    get_settings().audit_chain_mode = "off"
 
-    from vinzy_engine.deps import reset_singletons
+    from vinzy_engine.deps import get_audit_service, reset_singletons
     reset_singletons()
-
-    # Reset rate limiter state so tests don't hit limits from previous runs
-    from vinzy_engine.common.rate_limiting import limiter
-    limiter.reset()
+    get_audit_service()  # bind the audit service to the settings above
 
     from vinzy_engine.app import create_app
     return create_app()
 
 
-@pytest.fixture
-async def client(app):
-    # Manually init DB since ASGITransport doesn't run lifespan
-    from vinzy_engine.deps import get_db
-    db = get_db()
-    await db.init()
-    await db.create_all()
+@pytest.fixture(scope="session")
+async def db_engine():
+    """In-memory engine whose schema is created once for the whole session.
+
+    In-memory SQLite is private to the process, so each pytest-xdist worker
+    gets an isolated database without any per-worker URL.
+    """
+    from vinzy_engine.common.models import Base
+    import vinzy_engine.common.database  # noqa: F401  (registers all models)
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    # pysqlite/aiosqlite defer BEGIN; emit it ourselves so SAVEPOINTs nest
+    # inside the per-test outer transaction.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _no_implicit_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _explicit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def session_client(app):
+    """One ASGI client shared by every test; see ``client`` for isolation.
+
+    The app is warmed up before the first test: OpenAPI generation and the
+    first trip through the middleware stack happen here, not in whichever
+    test happens to run first.
+
+    ASGITransport does not run the app lifespan. Its startup (``db.init()``
+    and ``create_all()``) is replaced by the DB fixtures, so only the
+    webhook shutdown is mirrored here, once per session.
+    """
+    from vinzy_engine.deps import get_webhook_service
 
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+    async with AsyncClient(transport=transport, base_url="http://test", timeout=5.0) as ac:
+        app.openapi()
+        await ac.get("/health")
         yield ac
+    await get_webhook_service().close()
+
+
+@pytest.fixture(scope="module")
+async def db_connection(db_engine, app):
+    """Connection holding one outer transaction for the whole test module.
+
+    The app's sessions join it via a SAVEPOINT, so commits stay visible to
+    later requests while everything is rolled back when the module ends.
+
+    Depends on ``app`` so the DB singleton is rebound after ``app`` resets
+    singletons, even in modules whose first test only uses ``db``.
+    """
+    from vinzy_engine.deps import get_db
+
+    async with db_engine.connect() as conn:
+        outer = await conn.begin()
+        db = get_db()
+        db.engine = db_engine
+        db._session_factory = async_sessionmaker(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield conn
+        finally:
+            db.engine = None
+            db._session_factory = None
+            await outer.rollback()
+
 
-    await db.close()
+@pytest.fixture(scope="module")
+def service_db(db_connection):
+    """DatabaseManager whose sessions join ``db_connection`` via SAVEPOINTs.
+
+    Module-scoped fixtures use it to seed rows shared by the whole module.
+    """
+    from vinzy_engine.common.database import DatabaseManager
+
+    manager = DatabaseManager()
+    manager.engine = db_connection.engine
+    manager._session_factory = async_sessionmaker(
+        bind=db_connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    return manager
 
 
 @pytest.fixture
-def admin_headers():
-    return {"X-Vinzy-Api-Key": API_KEY}
+async def db(db_connection, service_db):
+    """DatabaseManager for service-level tests, on the session-wide schema.
+
+    Shares the module connection (in-memory SQLite has exactly one) and
+    rolls this test's writes back through a SAVEPOINT, replacing a fresh
+    engine plus create_all() per test.
+    """
+    savepoint = await db_connection.begin_nested()
+    try:
+        yield service_db
+    finally:
+        await savepoint.rollback()
 
 
 @pytest.fixture
+async def client(session_client, db_connection):
+    """The shared ASGI client, with this test's DB work rolled back at the end.
+
+    Rows seeded by wider-scoped fixtures (see ``seeded_product_customer``)
+    sit below this test's SAVEPOINT and survive it — no per-test create_all().
+    """
+    from vinzy_engine.common.rate_limiting import limiter
+
+    # Reset rate limiter state so tests don't hit limits from previous ones
+    limiter.reset()
+
+    savepoint = await db_connection.begin_nested()
+    try:
+        yield session_client
+    finally:
+        session_client.cookies.clear()
+        await savepoint.rollback()
+
+
+class Seeder:
+    """Create prerequisite rows through the service layer, skipping HTTP.
+
+    Helpers return dicts shaped like the matching API responses so tests
+    can index them the same way (``customer["id"]``, ``lic["key"]``).
+    """
+
+    def __init__(self):
+        from vinzy_engine.deps import (
+            get_db, get_licensing_service, get_tenant_service, get_webhook_service,
+        )
+
+        self._db = get_db()
+        self._licensing = get_licensing_service()
+        self._tenants = get_tenant_service()
+        self._webhooks = get_webhook_service()
+
+    async def tenant(self, name: str = "Acme", slug: str = "acme", **kwargs) -> dict:
+        async with self._db.get_session() as session:
+            tenant, raw_api_key = await self._tenants.create_tenant(session, name, slug, **kwargs)
+            return {"id": tenant.id, "name": tenant.name, "slug": tenant.slug,
+                    "api_key": raw_api_key}
+
+    async def webhook(
+        self, url: str = "https://example.com/hook",
+        secret: str = "my-super-secret-key-1234", **kwargs,
+    ) -> dict:
+        async with self._db.get_session() as session:
+            endpoint = await self._webhooks.create_endpoint(session, url, secret, **kwargs)
+            return {"id": endpoint.id, "url": endpoint.url, "status": endpoint.status}
+
+    async def _create_product(self, session, code="ZUL", name="Zuultimate", **kwargs) -> dict:
+        product = await self._licensing.create_product(session, code, name, **kwargs)
+        return {"id": product.id, "code": product.code, "name": product.name,
+                "features": product.features}
+
+    async def _create_customer(self, session, name="Test", email="test@example.com", **kwargs) -> dict:
+        customer = await self._licensing.create_customer(session, name, email, **kwargs)
+        return {"id": customer.id, "name": customer.name, "email": customer.email}
+
+    async def product(self, code: str = "ZUL", name: str = "Zuultimate", **kwargs) -> dict:
+        async with self._db.get_session() as session:
+            return await self._create_product(session, code, name, **kwargs)
+
+    async def customer(self, name: str = "Test", email: str = "test@example.com", **kwargs) -> dict:
+        async with self._db.get_session() as session:
+            return await self._create_customer(session, name, email, **kwargs)
+
+    async def product_and_customer(
+        self, product: dict | None = None, customer: dict | None = None,
+    ) -> tuple[dict, dict]:
+        """Create a product and a customer in one session and commit.
+
+        ``product`` and ``customer`` are keyword arguments for
+        :meth:`product` and :meth:`customer`.
+        """
+        async with self._db.get_session() as session:
+            return (
+                await self._create_product(session, **(product or {})),
+                await self._create_customer(session, **(customer or {})),
+            )
+
+    async def anomaly(self, license_id: str = "test-lic", **kwargs) -> str:
+        """Insert an unresolved high-severity anomaly row and return its id.
+
+        Uses a Core ``INSERT ... RETURNING``: the row is only ever read back
+        through the service, so there is no need to build an ORM instance.
+        """
+        from vinzy_engine.anomaly.models import AnomalyModel
+
+        values = {
+            "license_id": license_id, "anomaly_type": "z_score", "severity": "high",
+            "metric": "tokens", "z_score": 3.5, "baseline_mean": 100.0,
+            "baseline_stddev": 10.0, "observed_value": 135.0, "detail": {},
+            "resolved": False, **kwargs,
+        }
+        async with self._db.get_session() as session:
+            result = await session.execute(
+                insert(AnomalyModel).values(**values).returning(AnomalyModel.id)
+            )
+            return result.scalar_one()
+
+    async def license(
+        self, customer_id: str, product_code: str = "ZUL", machines_limit: int = 3, **kwargs,
+    ) -> dict:
+        async with self._db.get_session() as session:
+            license_obj, raw_key = await self._licensing.create_license(
+                session, product_code, customer_id, machines_limit=machines_limit, **kwargs,
+            )
+            return {"id": license_obj.id, "key": raw_key, "status": license_obj.status,
+                    "tier": license_obj.tier, "customer_id": customer_id}
+
+
+@pytest.fixture
+def seed(client):
+    """Service-layer seeding helpers bound to this test's DB transaction."""
+    return Seeder()
+
+
+@pytest.fixture(scope="class")
+async def seeded_product_customer(db_connection):
+    """Product ``ZUL`` and one customer, created once per test class.
+
+    Returns ``(product, customer)`` dicts; tests only need to create their
+    own licenses.
+    """
+    savepoint = await db_connection.begin_nested()
+    try:
+        yield await Seeder().product_and_customer(
+            product={"features": {"api": True, "export": {"enabled": True, "limit": 100}}},
+        )
+    finally:
+        await savepoint.rollback()
+
+
+@pytest.fixture(scope="module")
+def seed_module_license(db_connection):
+    """Async ``seed(seeder_args)`` creating a product, customer and license.
+
+    ``seeder_args`` are passed to ``Seeder.product_and_customer``; the
+    license dict is returned. For module-scoped fixtures only.
+    """
+    async def _seed(seeder_args: dict) -> dict:
+        # Module-scoped rows must sit directly in the module's outer transaction;
+        # inside a class or test SAVEPOINT they would vanish with it.
+        assert not db_connection.in_nested_transaction(), (
+            "module-scoped seed fixtures must be set up before class/test SAVEPOINTs"
+        )
+        seeder = Seeder()
+        product, customer = await seeder.product_and_customer(**seeder_args)
+        return await seeder.license(customer["id"], product_code=product["code"])
+
+    return _seed
+
+
+@pytest.fixture(scope="module")
+async def valid_license(seed_module_license):
+    """Active license on product ``VAL``, shared by every test in the module."""
+    return await seed_module_license({
+        "product": {"code": "VAL", "name": "Validation", "features": {"api": True}},
+        "customer": {"name": "Validate", "email": "validate@example.com"},
+    })
+
+
+@pytest.fixture(scope="module")
+def valid_license_key(valid_license):
+    return valid_license["key"]
+
+
+@pytest.fixture(scope="module")
+async def agent_license(seed_module_license):
+    """License on product ``AGT`` entitling CTO (premium) and CFO; CSecO is disabled."""
+    return await seed_module_license({
+        "product": {
+            "code": "AGT", "name": "Agents",
+            "features": {
+                "api": True,
+                "agents": {
+                    "CTO": {"enabled": True, "token_limit": 50000, "model_tier": "premium"},
+                    "CFO": {"enabled": True, "token_limit": 20000},
+                    "CSecO": {"enabled": False},
+                },
+            },
+        },
+        "customer": {"name": "AgentTest", "email": "agent@example.com"},
+    })
+
+
+@pytest.fixture
+def audit_chain(monkeypatch):
+    """Record the audit chain through the shared app for this test."""
+    from vinzy_engine.deps import get_audit_service
+
+    monkeypatch.setattr(get_audit_service().settings, "audit_chain_mode", "full")
+
+
+def _dashboard_cookies(role: str) -> dict:
+    from vinzy_engine.dashboard.auth import COOKIE_NAME, create_session_cookie
+
+    return {COOKIE_NAME: create_session_cookie(role)}
+
+
+@pytest.fixture(scope="module")
+def admin_cookies(app):
+    """Admin dashboard session cookie, signed once per module.
+
+    Signed directly instead of through ``POST /dashboard/login``, which
+    TestDashboardLogin covers. The cookie is a stateless signed value, so it
+    stays valid while the module keeps the same VINZY_SECRET_KEY.
+    """
+    return _dashboard_cookies("admin")
+
+
+@pytest.fixture(scope="module")
+def super_admin_cookies(app):
+    """Super-admin dashboard session cookie, signed once per module."""
+    return _dashboard_cookies("super_admin")
+
+
+@pytest.fixture
+def admin_client(client, admin_cookies):
+    """``client`` with an admin dashboard session in its cookie jar."""
+    client.cookies = admin_cookies
+    return client
+
+
+@pytest.fixture
+def super_admin_client(client, super_admin_cookies):
+    """``client`` with a super-admin dashboard session in its cookie jar."""
+    client.cookies = super_admin_cookies
+    return client
+
+
+# Shared across the session; read-only so no test can leak header changes.
+@pytest.fixture(scope="session")
+def admin_headers():
+    return MappingProxyType({"X-Vinzy-Api-Key": API_KEY})
+
+
+@pytest.fixture(scope="session")
 def super_admin_headers():
-    return {"X-Vinzy-Api-Key": SUPER_ADMIN_KEY}
+    return MappingProxyType({"X-Vinzy-Api-Key": SUPER_ADMIN_KEY})
@@ -24,10 +24,9 @@ async def seeded_anomaly(client, admin_headers):
             session, "ZUL", customer.id
         )
 
-    # Record baseline usage (10 normal values)
-    for _ in range(10):
-        async with db.get_session() as session:
-            await usage.record_usage(session, raw_key, "api_calls", 10.0)
+    # Record baseline usage (10 normal values) in one round-trip
+    async with db.get_session() as session:
+        await usage.record_usage_many(session, raw_key, "api_calls", [10.0] * 10)
 
     # Record spike to trigger anomaly
     async with db.get_session() as session:
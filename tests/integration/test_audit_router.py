@@ -2,25 +2,17 @@
 
 import pytest
 
+pytestmark = pytest.mark.usefixtures("audit_chain")
+
 
 class TestAuditRouter:
-    async def _setup(self, client, admin_headers):
-        """Create product + customer + license."""
-        await client.post("/products", json={
-            "code": "ZUL", "name": "Zuultimate",
-        }, headers=admin_headers)
-        cust_resp = await client.post("/customers", json={
-            "name": "Test", "email": "test@example.com",
-        }, headers=admin_headers)
-        lic_resp = await client.post("/licenses", json={
-            "product_code": "ZUL",
-            "customer_id": cust_resp.json()["id"],
-            "tier": "pro",
-        }, headers=admin_headers)
-        return lic_resp.json()
+    async def _setup(self, seed, seeded_product_customer):
+        """Create a license for the class's seeded product + customer."""
+        _, customer = seeded_product_customer
+        return await seed.license(customer["id"], tier="pro")
 
-    async def test_get_audit_events(self, client, admin_headers):
-        lic = await self._setup(client, admin_headers)
+    async def test_get_audit_events(self, client, admin_headers, seed, seeded_product_customer):
+        lic = await self._setup(seed, seeded_product_customer)
         # Creating a license auto-records an audit event
         resp = await client.get(
             f"/audit/{lic['id']}", headers=admin_headers,
@@ -32,8 +24,8 @@ class TestAuditRouter:
         assert events[0]["event_hash"] is not None
         assert events[0]["signature"] is not None
 
-    async def test_verify_chain_endpoint(self, client, admin_headers):
-        lic = await self._setup(client, admin_headers)
+    async def test_verify_chain_endpoint(self, client, admin_headers, seed, seeded_product_customer):
+        lic = await self._setup(seed, seeded_product_customer)
         resp = await client.get(
             f"/audit/{lic['id']}/verify", headers=admin_headers,
         )
@@ -42,8 +34,8 @@ class TestAuditRouter:
         assert data["valid"] is True
         assert data["events_checked"] >= 1
 
-    async def test_audit_auto_recorded_on_create(self, client, admin_headers):
-        lic = await self._setup(client, admin_headers)
+    async def test_audit_auto_recorded_on_create(self, client, admin_headers, seed, seeded_product_customer):
+        lic = await self._setup(seed, seeded_product_customer)
         resp = await client.get(
             f"/audit/{lic['id']}?event_type=license.created",
             headers=admin_headers,
@@ -53,8 +45,8 @@ class TestAuditRouter:
         assert len(events) == 1
         assert events[0]["detail"]["product_code"] == "ZUL"
 
-    async def test_audit_auto_recorded_on_validate(self, client, admin_headers):
-        lic = await self._setup(client, admin_headers)
+    async def test_audit_auto_recorded_on_validate(self, client, admin_headers, seed, seeded_product_customer):
+        lic = await self._setup(seed, seeded_product_customer)
         # Validate the license
         await client.get(f"/validate?key={lic['key']}")
         resp = await client.get(
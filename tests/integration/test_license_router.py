@@ -11,6 +11,11 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
         assert data["service"] == "vinzy-engine"
 
+    def test_json_responses_use_orjson(self, app):
+        pytest.importorskip("orjson")
+        from fastapi.responses import ORJSONResponse
+        assert app.router.default_response_class is ORJSONResponse
+
 
 class TestProductEndpoints:
     async def test_create_product(self, client, admin_headers):
@@ -22,9 +27,9 @@ class TestProductEndpoints:
         assert data["code"] == "ZUL"
         assert data["id"]
 
-    async def test_list_products(self, client, admin_headers):
-        await client.post("/products", json={"code": "ZUL", "name": "Zuultimate"}, headers=admin_headers)
-        await client.post("/products", json={"code": "NXS", "name": "Nexus"}, headers=admin_headers)
+    async def test_list_products(self, client, admin_headers, seed):
+        await seed.product("ZUL", "Zuultimate")
+        await seed.product("NXS", "Nexus")
         resp = await client.get("/products", headers=admin_headers)
         assert resp.status_code == 200
         assert len(resp.json()) == 2
@@ -38,27 +43,18 @@ class TestCustomerEndpoints:
         assert resp.status_code == 201
         assert resp.json()["email"] == "test@example.com"
 
-    async def test_list_customers(self, client, admin_headers):
-        await client.post("/customers", json={"name": "A", "email": "a@ex.com"}, headers=admin_headers)
-        await client.post("/customers", json={"name": "B", "email": "b@ex.com"}, headers=admin_headers)
+    async def test_list_customers(self, client, admin_headers, seed):
+        await seed.customer("A", "a@ex.com")
+        await seed.customer("B", "b@ex.com")
         resp = await client.get("/customers", headers=admin_headers)
         assert resp.status_code == 200
         assert len(resp.json()) == 2
 
 
 class TestLicenseEndpoints:
-    async def _setup(self, client, admin_headers):
-        prod_resp = await client.post("/products", json={
-            "code": "ZUL", "name": "Zuultimate",
-            "features": {"api": True, "export": {"enabled": True, "limit": 100}},
-        }, headers=admin_headers)
-        cust_resp = await client.post("/customers", json={
-            "name": "Test", "email": "test@example.com",
-        }, headers=admin_headers)
-        return prod_resp.json(), cust_resp.json()
 
-    async def test_create_license(self, client, admin_headers):
-        product, customer = await self._setup(client, admin_headers)
+    async def test_create_license(self, client, admin_headers, seeded_product_customer):
+        product, customer = seeded_product_customer
         resp = await client.post("/licenses", json={
             "product_code": "ZUL",
             "customer_id": customer["id"],
@@ -71,17 +67,18 @@ class TestLicenseEndpoints:
         assert data["status"] == "active"
         assert data["tier"] == "pro"
 
-    async def test_list_licenses(self, client, admin_headers):
-        product, customer = await self._setup(client, admin_headers)
-        await client.post("/licenses", json={
-            "product_code": "ZUL", "customer_id": customer["id"],
-        }, headers=admin_headers)
+    async def test_list_licenses(self, client, admin_headers, seed, seeded_product_customer):
+        product, customer = seeded_product_customer
+        await seed.license(customer["id"])
+        await seed.license(customer["id"])
         resp = await client.get("/licenses", headers=admin_headers)
         assert resp.status_code == 200
-        assert len(resp.json()) >= 1
+        data = resp.json()
+        assert len(data) == 2
+        assert {lic["product_code"] for lic in data} == {"ZUL"}
 
-    async def test_get_license(self, client, admin_headers):
-        product, customer = await self._setup(client, admin_headers)
+    async def test_get_license(self, client, admin_headers, seeded_product_customer):
+        product, customer = seeded_product_customer
         create_resp = await client.post("/licenses", json={
             "product_code": "ZUL", "customer_id": customer["id"],
         }, headers=admin_headers)
@@ -90,8 +87,8 @@ class TestLicenseEndpoints:
         assert resp.status_code == 200
         assert resp.json()["id"] == lic_id
 
-    async def test_update_license(self, client, admin_headers):
-        product, customer = await self._setup(client, admin_headers)
+    async def test_update_license(self, client, admin_headers, seeded_product_customer):
+        product, customer = seeded_product_customer
         create_resp = await client.post("/licenses", json={
             "product_code": "ZUL", "customer_id": customer["id"],
         }, headers=admin_headers)
@@ -102,8 +99,8 @@ class TestLicenseEndpoints:
         assert resp.status_code == 200
         assert resp.json()["status"] == "suspended"
 
-    async def test_delete_license(self, client, admin_headers):
-        product, customer = await self._setup(client, admin_headers)
+    async def test_delete_license(self, client, admin_headers, seeded_product_customer):
+        product, customer = seeded_product_customer
         create_resp = await client.post("/licenses", json={
             "product_code": "ZUL", "customer_id": customer["id"],
         }, headers=admin_headers)
@@ -115,23 +112,19 @@ class TestLicenseEndpoints:
         assert get_resp.status_code == 404
 
 
+def _validate_request(client, method, path, payload):
+    """Send a validate call as GET query params or a POST JSON body."""
+    if method == "GET":
+        return client.get(path, params=payload)
+    return client.post(path, json=payload)
+
+
 class TestValidationEndpoint:
-    async def _create_license(self, client, admin_headers):
-        await client.post("/products", json={
-            "code": "ZUL", "name": "Zuultimate",
-            "features": {"api": True},
-        }, headers=admin_headers)
-        cust = await client.post("/customers", json={
-            "name": "T", "email": "t@example.com",
-        }, headers=admin_headers)
-        lic_resp = await client.post("/licenses", json={
-            "product_code": "ZUL", "customer_id": cust.json()["id"],
-        }, headers=admin_headers)
-        return lic_resp.json()["key"]
+    """GET /validate and the preferred POST /validate share these checks."""
 
-    async def test_validate_valid_key(self, client, admin_headers):
-        key = await self._create_license(client, admin_headers)
-        resp = await client.get("/validate", params={"key": key})
+    @pytest.mark.parametrize("method", ["GET", "POST"])
+    async def test_validate_valid_key(self, client, valid_license_key, method):
+        resp = await _validate_request(client, method, "/validate", {"key": valid_license_key})
         assert resp.status_code == 200
         data = resp.json()
         assert data["valid"] is True
@@ -144,123 +137,34 @@ class TestValidationEndpoint:
         assert "lease_expires_at" in lease
         assert lease["payload"]["status"] == "active"
 
-    async def test_validate_invalid_key(self, client):
-        resp = await client.get("/validate", params={"key": "bad-key"})
+    @pytest.mark.parametrize("method", ["GET", "POST"])
+    async def test_validate_invalid_key(self, client, method):
+        resp = await _validate_request(client, method, "/validate", {"key": "bad-key"})
         assert resp.status_code == 200
         data = resp.json()
         assert data["valid"] is False
 
 
-class TestAgentValidationEndpoint:
-    async def _create_agent_license(self, client, admin_headers):
-        await client.post("/products", json={
-            "code": "ZUL", "name": "Zuultimate",
-            "features": {
-                "api": True,
-                "agents": {
-                    "CTO": {"enabled": True, "token_limit": 50000, "model_tier": "premium"},
-                    "CSecO": {"enabled": False},
-                },
-            },
-        }, headers=admin_headers)
-        cust = await client.post("/customers", json={
-            "name": "AgentTest", "email": "agent@example.com",
-        }, headers=admin_headers)
-        lic_resp = await client.post("/licenses", json={
-            "product_code": "ZUL", "customer_id": cust.json()["id"],
-        }, headers=admin_headers)
-        return lic_resp.json()
-
-    async def test_validate_agent_endpoint(self, client, admin_headers):
-        lic = await self._create_agent_license(client, admin_headers)
-        # Entitled agent
-        resp = await client.get("/validate/agent", params={
-            "key": lic["key"], "agent_code": "CTO",
-        })
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["valid"] is True
-        assert data["agent_code"] == "CTO"
-        assert data["token_limit"] == 50000
-        # Disabled agent
-        resp = await client.get("/validate/agent", params={
-            "key": lic["key"], "agent_code": "CSecO",
-        })
-        data = resp.json()
-        assert data["valid"] is False
-        assert data["code"] == "AGENT_NOT_ENTITLED"
-
-
 class TestPostValidationEndpoint:
-    """Tests for the preferred POST /validate endpoint."""
-
-    async def _create_license(self, client, admin_headers):
-        await client.post("/products", json={
-            "code": "ZUL", "name": "Zuultimate",
-            "features": {"api": True},
-        }, headers=admin_headers)
-        cust = await client.post("/customers", json={
-            "name": "T", "email": "t@example.com",
-        }, headers=admin_headers)
-        lic_resp = await client.post("/licenses", json={
-            "product_code": "ZUL", "customer_id": cust.json()["id"],
-        }, headers=admin_headers)
-        return lic_resp.json()["key"]
+    """POST-only behaviour of /validate."""
 
-    async def test_post_validate_valid_key(self, client, admin_headers):
-        key = await self._create_license(client, admin_headers)
-        resp = await client.post("/validate", json={"key": key})
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["valid"] is True
-        assert data["code"] == "OK"
-        assert data["lease"] is not None
-        assert data["lease"]["payload"]["status"] == "active"
-        assert "signature" in data["lease"]
-
-    async def test_post_validate_with_fingerprint(self, client, admin_headers):
-        key = await self._create_license(client, admin_headers)
-        resp = await client.post("/validate", json={"key": key, "fingerprint": "fp-abc"})
+    async def test_post_validate_with_fingerprint(self, client, valid_license_key):
+        resp = await client.post("/validate", json={"key": valid_license_key, "fingerprint": "fp-abc"})
         assert resp.status_code == 200
         assert resp.json()["valid"] is True
 
-    async def test_post_validate_invalid_key(self, client):
-        resp = await client.post("/validate", json={"key": "bad-key"})
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["valid"] is False
-
     async def test_post_validate_missing_key(self, client):
         resp = await client.post("/validate", json={})
         assert resp.status_code == 422  # Pydantic validation error
 
 
-class TestPostAgentValidationEndpoint:
-    """Tests for the preferred POST /validate/agent endpoint."""
-
-    async def _create_agent_license(self, client, admin_headers):
-        await client.post("/products", json={
-            "code": "ZUL", "name": "Zuultimate",
-            "features": {
-                "api": True,
-                "agents": {
-                    "CTO": {"enabled": True, "token_limit": 50000, "model_tier": "premium"},
-                    "CSecO": {"enabled": False},
-                },
-            },
-        }, headers=admin_headers)
-        cust = await client.post("/customers", json={
-            "name": "AgentPost", "email": "apost@example.com",
-        }, headers=admin_headers)
-        lic_resp = await client.post("/licenses", json={
-            "product_code": "ZUL", "customer_id": cust.json()["id"],
-        }, headers=admin_headers)
-        return lic_resp.json()
+class TestAgentValidationEndpoint:
+    """GET and POST /validate/agent."""
 
-    async def test_post_validate_agent_entitled(self, client, admin_headers):
-        lic = await self._create_agent_license(client, admin_headers)
-        resp = await client.post("/validate/agent", json={
-            "key": lic["key"], "agent_code": "CTO",
+    @pytest.mark.parametrize("method", ["GET", "POST"])
+    async def test_validate_agent_entitled(self, client, agent_license, method):
+        resp = await _validate_request(client, method, "/validate/agent", {
+            "key": agent_license["key"], "agent_code": "CTO",
         })
         assert resp.status_code == 200
         data = resp.json()
@@ -269,17 +173,18 @@ class TestPostAgentValidationEndpoint:
         assert data["token_limit"] == 50000
         assert data["model_tier"] == "premium"
 
-    async def test_post_validate_agent_not_entitled(self, client, admin_headers):
-        lic = await self._create_agent_license(client, admin_headers)
-        resp = await client.post("/validate/agent", json={
-            "key": lic["key"], "agent_code": "CSecO",
+    @pytest.mark.parametrize("method", ["GET", "POST"])
+    async def test_validate_agent_not_entitled(self, client, agent_license, method):
+        resp = await _validate_request(client, method, "/validate/agent", {
+            "key": agent_license["key"], "agent_code": "CSecO",
         })
         data = resp.json()
         assert data["valid"] is False
         assert data["code"] == "AGENT_NOT_ENTITLED"
 
-    async def test_post_validate_agent_invalid_key(self, client):
-        resp = await client.post("/validate/agent", json={
+    @pytest.mark.parametrize("method", ["GET", "POST"])
+    async def test_validate_agent_invalid_key(self, client, method):
+        resp = await _validate_request(client, method, "/validate/agent", {
             "key": "bad-key", "agent_code": "CTO",
         })
         assert resp.status_code == 200
@@ -290,28 +195,8 @@ class TestPostAgentValidationEndpoint:
 class TestListEntitledAgentsEndpoint:
     """Tests for GET /licenses/{id}/agents."""
 
-    async def _create_agent_license(self, client, admin_headers):
-        await client.post("/products", json={
-            "code": "ZUL", "name": "Zuultimate",
-            "features": {
-                "agents": {
-                    "CTO": {"enabled": True, "token_limit": 50000, "model_tier": "premium"},
-                    "CFO": {"enabled": True, "token_limit": 20000},
-                    "CSecO": {"enabled": False},
-                },
-            },
-        }, headers=admin_headers)
-        cust = await client.post("/customers", json={
-            "name": "AgentList", "email": "alist@example.com",
-        }, headers=admin_headers)
-        lic_resp = await client.post("/licenses", json={
-            "product_code": "ZUL", "customer_id": cust.json()["id"],
-        }, headers=admin_headers)
-        return lic_resp.json()
-
-    async def test_list_entitled_agents(self, client, admin_headers):
-        lic = await self._create_agent_license(client, admin_headers)
-        resp = await client.get(f"/licenses/{lic['id']}/agents", headers=admin_headers)
+    async def test_list_entitled_agents(self, client, admin_headers, agent_license):
+        resp = await client.get(f"/licenses/{agent_license['id']}/agents", headers=admin_headers)
         assert resp.status_code == 200
         agents = resp.json()
         codes = {a["agent_code"] for a in agents}
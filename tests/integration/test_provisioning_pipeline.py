@@ -1,6 +1,5 @@
 """Integration test for the full provisioning pipeline: webhook → service → Zuultimate."""
 
-import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from vinzy_engine.provisioning.schemas import ProvisioningRequest
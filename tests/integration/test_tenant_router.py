@@ -1,8 +1,5 @@
 """Integration tests for tenant router — super-admin auth required."""
 
-import pytest
-
-
 SUPER_ADMIN_KEY = "test-super-admin-key"
 
 
@@ -33,15 +30,12 @@ class TestTenantRouter:
         assert data["slug"] == "acme"
         assert data["api_key"].startswith("vzt_")
 
-    async def test_list_tenants(self, client, super_admin_headers):
-        await client.post(
-            "/tenants",
-            json={"name": "A", "slug": "a"},
-            headers=super_admin_headers,
-        )
+    async def test_list_tenants(self, client, super_admin_headers, seed):
+        await seed.tenant("A", "a")
+        await seed.tenant("B", "b")
         resp = await client.get("/tenants", headers=super_admin_headers)
         assert resp.status_code == 200
-        assert len(resp.json()) >= 1
+        assert {t["slug"] for t in resp.json()} == {"a", "b"}
 
     async def test_list_tenants_requires_auth(self, client):
         resp = await client.get("/tenants")
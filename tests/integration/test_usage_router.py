@@ -1,24 +1,14 @@
 """Integration tests for usage endpoints."""
 
-import pytest
-
 
 class TestUsageRouter:
-    async def _create_license(self, client, admin_headers, entitlements=None):
-        await client.post("/products", json={"code": "ZUL", "name": "Zuultimate"}, headers=admin_headers)
-        cust = await client.post("/customers", json={
-            "name": "T", "email": "t@example.com",
-        }, headers=admin_headers)
-        lic_resp = await client.post("/licenses", json={
-            "product_code": "ZUL",
-            "customer_id": cust.json()["id"],
-            "entitlements": entitlements or {},
-        }, headers=admin_headers)
-        data = lic_resp.json()
-        return data["key"], data["id"]
+    async def _create_license(self, seed, seeded_product_customer, entitlements=None):
+        _, customer = seeded_product_customer
+        lic = await seed.license(customer["id"], entitlements=entitlements or {})
+        return lic["key"], lic["id"]
 
-    async def test_record_usage(self, client, admin_headers):
-        key, lic_id = await self._create_license(client, admin_headers)
+    async def test_record_usage(self, client, seed, seeded_product_customer):
+        key, lic_id = await self._create_license(seed, seeded_product_customer)
         resp = await client.post("/usage/record", json={
             "key": key, "metric": "api-calls", "value": 5.0,
         })
@@ -27,8 +17,8 @@ class TestUsageRouter:
         assert data["success"] is True
         assert data["value_added"] == 5.0
 
-    async def test_record_usage_accumulates(self, client, admin_headers):
-        key, lic_id = await self._create_license(client, admin_headers)
+    async def test_record_usage_accumulates(self, client, seed, seeded_product_customer):
+        key, lic_id = await self._create_license(seed, seeded_product_customer)
         await client.post("/usage/record", json={
             "key": key, "metric": "tokens", "value": 100,
         })
@@ -37,8 +27,8 @@ class TestUsageRouter:
         })
         assert resp.json()["total_value"] == 150.0
 
-    async def test_get_usage_summary(self, client, admin_headers):
-        key, lic_id = await self._create_license(client, admin_headers)
+    async def test_get_usage_summary(self, client, admin_headers, seed, seeded_product_customer):
+        key, lic_id = await self._create_license(seed, seeded_product_customer)
         await client.post("/usage/record", json={
             "key": key, "metric": "api-calls", "value": 3,
         })
@@ -56,18 +46,18 @@ class TestUsageRouter:
         })
         assert resp.json()["success"] is False
 
-    async def test_agent_usage_endpoint(self, client, admin_headers):
-        key, lic_id = await self._create_license(client, admin_headers)
+    async def test_agent_usage_endpoint(self, client, admin_headers, seed, seeded_product_customer):
+        key, lic_id = await self._create_license(seed, seeded_product_customer)
         # Record agent-prefixed usage
-        await client.post("/usage/record", json={
-            "key": key, "metric": "agent.CTO.tokens", "value": 3000,
-        })
-        await client.post("/usage/record", json={
-            "key": key, "metric": "agent.CTO.delegations", "value": 5,
-        })
-        await client.post("/usage/record", json={
-            "key": key, "metric": "agent.CFO.tokens", "value": 1000,
+        resp = await client.post("/usage/record_batch", json={
+            "key": key,
+            "records": [
+                {"metric": "agent.CTO.tokens", "value": 3000},
+                {"metric": "agent.CTO.delegations", "value": 5},
+                {"metric": "agent.CFO.tokens", "value": 1000},
+            ],
         })
+        assert resp.json()["success"] is True
         resp = await client.get(
             f"/usage/agents/{lic_id}", headers=admin_headers,
         )
@@ -76,3 +66,41 @@ class TestUsageRouter:
         assert data["CTO"]["tokens"] == 3000
         assert data["CTO"]["delegations"] == 5
         assert data["CFO"]["tokens"] == 1000
+
+    async def test_record_batch(self, client, admin_headers, seed, seeded_product_customer):
+        key, lic_id = await self._create_license(
+            seed, seeded_product_customer,
+            entitlements={"tokens": {"enabled": True, "limit": 1000}},
+        )
+        resp = await client.post("/usage/record_batch", json={
+            "key": key,
+            "records": [
+                {"metric": "tokens", "value": 100},
+                {"metric": "api-calls", "value": 1},
+                {"metric": "tokens", "value": 50},
+            ],
+        })
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["success"] is True
+        results = {r["metric"]: r for r in data["results"]}
+        assert results["tokens"]["value_added"] == 150
+        assert results["tokens"]["remaining"] == 850
+        assert results["api-calls"]["total_value"] == 1
+
+        resp = await client.get(f"/usage/{lic_id}", headers=admin_headers)
+        counts = {s["metric"]: s["record_count"] for s in resp.json()}
+        assert counts == {"tokens": 2, "api-calls": 1}
+
+    async def test_record_batch_bad_key(self, client):
+        resp = await client.post("/usage/record_batch", json={
+            "key": "bad-key", "records": [{"metric": "api-calls"}],
+        })
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["success"] is False
+        assert data["results"] == []
+
+    async def test_record_batch_rejects_empty(self, client):
+        resp = await client.post("/usage/record_batch", json={"key": "k", "records": []})
+        assert resp.status_code == 422
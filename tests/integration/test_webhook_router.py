@@ -2,7 +2,11 @@
 
 import pytest
 
-from vinzy_engine.deps import get_webhook_service
+
+@pytest.fixture
+async def endpoint_id(seed):
+    """An active endpoint created through the service, inside the test's savepoint."""
+    return (await seed.webhook(description="My hook"))["id"]
 
 
 class TestCreateWebhookEndpoint:
@@ -57,6 +61,15 @@ class TestCreateWebhookEndpoint:
         )
         assert resp.status_code == 422
 
+    @pytest.mark.parametrize("url", ["not a url", "ftp://example.com/hook", "https://"])
+    async def test_create_rejects_invalid_url(self, client, admin_headers, url):
+        resp = await client.post(
+            "/webhooks",
+            headers=admin_headers,
+            json={"url": url, "secret": "my-super-secret-key-1234"},
+        )
+        assert resp.status_code == 422
+
 
 class TestListWebhookEndpoints:
     async def test_list_empty(self, client, admin_headers):
@@ -111,39 +124,14 @@ class TestListWebhookEndpoints:
 
 
 class TestGetWebhookEndpoint:
-    async def test_get_endpoint(self, client, admin_headers):
-        r = await client.post(
-            "/webhooks",
-            headers=admin_headers,
-            json={
-                "url": "https://example.com/hook",
-                "secret": "my-super-secret-key-1234",
-                "description": "My hook",
-            },
-        )
-        endpoint_id = r.json()["id"]
-
+    async def test_get_endpoint(self, client, admin_headers, endpoint_id):
         resp = await client.get(f"/webhooks/{endpoint_id}", headers=admin_headers)
         assert resp.status_code == 200
         assert resp.json()["description"] == "My hook"
 
-    async def test_get_nonexistent(self, client, admin_headers):
-        resp = await client.get("/webhooks/fake-id", headers=admin_headers)
-        assert resp.status_code == 404
-
 
 class TestUpdateWebhookEndpoint:
-    async def test_update_endpoint(self, client, admin_headers):
-        r = await client.post(
-            "/webhooks",
-            headers=admin_headers,
-            json={
-                "url": "https://old.com/hook",
-                "secret": "my-super-secret-key-1234",
-            },
-        )
-        endpoint_id = r.json()["id"]
-
+    async def test_update_endpoint(self, client, admin_headers, endpoint_id):
         resp = await client.patch(
             f"/webhooks/{endpoint_id}",
             headers=admin_headers,
@@ -153,45 +141,33 @@ class TestUpdateWebhookEndpoint:
         assert resp.json()["url"] == "https://new.com/hook"
         assert resp.json()["status"] == "paused"
 
-    async def test_update_nonexistent(self, client, admin_headers):
+    async def test_update_rejects_invalid_status(self, client, admin_headers, endpoint_id):
         resp = await client.patch(
-            "/webhooks/fake-id",
+            f"/webhooks/{endpoint_id}",
             headers=admin_headers,
-            json={"url": "https://new.com"},
+            json={"status": "invalid_status"},
         )
-        assert resp.status_code == 404
+        assert resp.status_code == 422
 
-    async def test_update_rejects_invalid_status(self, client, admin_headers):
-        r = await client.post(
-            "/webhooks",
+    async def test_update_rejects_invalid_event_type(self, client, admin_headers):
+        resp = await client.patch(
+            "/webhooks/fake-id",
             headers=admin_headers,
-            json={
-                "url": "https://example.com/hook",
-                "secret": "my-super-secret-key-1234",
-            },
+            json={"event_types": ["license.created", "not.a.real.event"]},
         )
-        endpoint_id = r.json()["id"]
+        assert resp.status_code == 422
 
+    async def test_update_rejects_invalid_url(self, client, admin_headers):
         resp = await client.patch(
-            f"/webhooks/{endpoint_id}",
+            "/webhooks/fake-id",
             headers=admin_headers,
-            json={"status": "invalid_status"},
+            json={"url": "not a url"},
         )
         assert resp.status_code == 422
 
 
 class TestDeleteWebhookEndpoint:
-    async def test_delete_endpoint(self, client, admin_headers):
-        r = await client.post(
-            "/webhooks",
-            headers=admin_headers,
-            json={
-                "url": "https://example.com/hook",
-                "secret": "my-super-secret-key-1234",
-            },
-        )
-        endpoint_id = r.json()["id"]
-
+    async def test_delete_endpoint(self, client, admin_headers, endpoint_id):
         resp = await client.delete(f"/webhooks/{endpoint_id}", headers=admin_headers)
         assert resp.status_code == 204
 
@@ -199,23 +175,9 @@ class TestDeleteWebhookEndpoint:
         resp = await client.get(f"/webhooks/{endpoint_id}", headers=admin_headers)
         assert resp.status_code == 404
 
-    async def test_delete_nonexistent(self, client, admin_headers):
-        resp = await client.delete("/webhooks/fake-id", headers=admin_headers)
-        assert resp.status_code == 404
-
 
 class TestDeliveryLog:
-    async def test_deliveries_empty(self, client, admin_headers):
-        r = await client.post(
-            "/webhooks",
-            headers=admin_headers,
-            json={
-                "url": "https://example.com/hook",
-                "secret": "my-super-secret-key-1234",
-            },
-        )
-        endpoint_id = r.json()["id"]
-
+    async def test_deliveries_empty(self, client, admin_headers, endpoint_id):
         resp = await client.get(
             f"/webhooks/{endpoint_id}/deliveries",
             headers=admin_headers,
@@ -223,26 +185,34 @@ class TestDeliveryLog:
         assert resp.status_code == 200
         assert resp.json() == []
 
-    async def test_deliveries_nonexistent_endpoint(self, client, admin_headers):
-        resp = await client.get(
-            "/webhooks/fake-id/deliveries",
-            headers=admin_headers,
-        )
-        assert resp.status_code == 404
+    async def test_json_null_columns_read_as_empty(self, client, admin_headers, endpoint_id):
+        from sqlalchemy import insert, update
 
+        from vinzy_engine.deps import get_db
+        from vinzy_engine.webhooks.models import WebhookDeliveryModel, WebhookEndpointModel
+
+        # None is stored as a JSON ``null`` and loads back as None.
+        async with get_db().get_session() as session:
+            await session.execute(
+                update(WebhookEndpointModel)
+                .where(WebhookEndpointModel.id == endpoint_id)
+                .values(event_types=None)
+            )
+            await session.execute(insert(WebhookDeliveryModel).values(
+                endpoint_id=endpoint_id, event_type="license.created", payload=None,
+            ))
+
+        resp = await client.get(f"/webhooks/{endpoint_id}", headers=admin_headers)
+        assert resp.status_code == 200
+        assert resp.json()["event_types"] == []
+
+        resp = await client.get(f"/webhooks/{endpoint_id}/deliveries", headers=admin_headers)
+        assert resp.status_code == 200
+        assert [d["payload"] for d in resp.json()] == [{}]
 
-class TestTestPing:
-    async def test_test_ping(self, client, admin_headers):
-        r = await client.post(
-            "/webhooks",
-            headers=admin_headers,
-            json={
-                "url": "https://example.com/hook",
-                "secret": "my-super-secret-key-1234",
-            },
-        )
-        endpoint_id = r.json()["id"]
 
+class TestTestPing:
+    async def test_test_ping(self, client, admin_headers, endpoint_id):
         resp = await client.post(
             f"/webhooks/{endpoint_id}/test",
             headers=admin_headers,
@@ -253,19 +223,16 @@ class TestTestPing:
         assert data["event_type"] == "webhook.test"
         assert data["status"] == "pending"
 
-    async def test_test_ping_nonexistent(self, client, admin_headers):
-        resp = await client.post(
-            "/webhooks/fake-id/test",
-            headers=admin_headers,
-            json={},
-        )
-        assert resp.status_code == 404
-
 
-class TestRetryDelivery:
-    async def test_retry_nonexistent(self, client, admin_headers):
-        resp = await client.post(
-            "/webhooks/deliveries/fake-id/retry",
-            headers=admin_headers,
-        )
+class TestUnknownEndpoint:
+    @pytest.mark.parametrize(("method", "path", "body"), [
+        ("GET", "/webhooks/fake-id", None),
+        ("PATCH", "/webhooks/fake-id", {"url": "https://new.com"}),
+        ("DELETE", "/webhooks/fake-id", None),
+        ("GET", "/webhooks/fake-id/deliveries", None),
+        ("POST", "/webhooks/fake-id/test", None),
+        ("POST", "/webhooks/deliveries/fake-id/retry", None),
+    ], ids=["get", "update", "delete", "deliveries", "test-ping", "retry"])
+    async def test_returns_404(self, client, admin_headers, method, path, body):
+        resp = await client.request(method, path, headers=admin_headers, json=body)
         assert resp.status_code == 404
@@ -4,11 +4,12 @@ These tests measure throughput and latency of critical paths.
 They're not correctness tests — they establish baseline performance
 numbers for regression detection.
 
-Run with: pytest tests/test_benchmarks.py -v
+Deselected by default; run with: pytest -m benchmark -v
 """
 
-import time
 import statistics
+import time
+import timeit
 
 import pytest
 
@@ -16,8 +17,9 @@ from vinzy_engine.keygen.generator import generate_key
 from vinzy_engine.keygen.validator import validate_key, validate_key_multi
 from vinzy_engine.keygen.lease import create_lease, verify_lease
 
-from tests.conftest import HMAC_KEY, API_KEY, SUPER_ADMIN_KEY
+from tests.conftest import HMAC_KEY
 
+pytestmark = pytest.mark.benchmark
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -27,23 +29,31 @@ BENCH_ITERATIONS = 1000
 HMAC_KEYS = {0: HMAC_KEY, 1: "secondary-hmac-key-for-testing"}
 
 
-def _bench(fn, iterations=BENCH_ITERATIONS):
-    """Run fn `iterations` times, return (total_ms, avg_ms, ops_per_sec)."""
-    timings = []
-    for _ in range(iterations):
-        start = time.perf_counter()
+def _bench(fn, iterations=BENCH_ITERATIONS, repeat=7, samples=200):
+    """Time fn, return throughput and latency stats in milliseconds.
+
+    Throughput and avg come from timeit's C loop (best of ``repeat`` runs of
+    ``iterations // repeat`` calls), so sub-microsecond ops are not swamped
+    by per-call timer overhead. p50/p99 come from ``samples`` individually
+    timed calls.
+    """
+    number = max(1, iterations // repeat)
+    best = min(timeit.Timer(fn).repeat(repeat=repeat, number=number))
+
+    timings = [0] * samples
+    for i in range(samples):
+        start = time.perf_counter_ns()
         fn()
-        timings.append((time.perf_counter() - start) * 1000)
-    total = sum(timings)
-    avg = statistics.mean(timings)
-    ops = iterations / (total / 1000) if total > 0 else 0
+        timings[i] = time.perf_counter_ns() - start
+    timings.sort()
+
     return {
-        "iterations": iterations,
-        "total_ms": round(total, 2),
-        "avg_ms": round(avg, 4),
-        "p50_ms": round(statistics.median(timings), 4),
-        "p99_ms": round(sorted(timings)[int(iterations * 0.99)], 4),
-        "ops_per_sec": round(ops),
+        "iterations": number * repeat,
+        "total_ms": round(best * 1000, 2),
+        "avg_ms": round(best * 1000 / number, 4),
+        "p50_ms": round(timings[samples // 2] / 1e6, 4),
+        "p99_ms": round(timings[int(samples * 0.99)] / 1e6, 4),
+        "ops_per_sec": round(number / best) if best > 0 else 0,
     }
 
 
@@ -81,27 +91,28 @@ class TestKeygenBenchmarks:
 class TestValidationBenchmarks:
     """Benchmark key validation throughput."""
 
-    @pytest.fixture(autouse=True)
-    def setup_keys(self):
-        self.valid_key = generate_key("TST", HMAC_KEY, version=0)
-        self.invalid_key = "TST-AAAAA-BBBBB-CCCCC-DDDDD-EEEEE-XXXXX-YYYYY"
+    INVALID_KEY = "TST-AAAAA-BBBBB-CCCCC-DDDDD-EEEEE-XXXXX-YYYYY"
+
+    @pytest.fixture(scope="class")
+    def valid_key(self):
+        return generate_key("TST", HMAC_KEY, version=0)
 
-    def test_validate_key_valid_throughput(self):
+    def test_validate_key_valid_throughput(self, valid_key):
         """Valid key validation should exceed 10K ops/sec."""
-        stats = _bench(lambda: validate_key(self.valid_key, HMAC_KEY))
+        stats = _bench(lambda: validate_key(valid_key, HMAC_KEY))
         assert stats["ops_per_sec"] > 10_000
         print(f"\n  validate_key (valid): {stats['ops_per_sec']:,} ops/sec, "
               f"avg={stats['avg_ms']:.4f}ms")
 
     def test_validate_key_invalid_throughput(self):
         """Invalid key rejection should be equally fast."""
-        stats = _bench(lambda: validate_key(self.invalid_key, HMAC_KEY))
+        stats = _bench(lambda: validate_key(self.INVALID_KEY, HMAC_KEY))
         assert stats["ops_per_sec"] > 10_000
         print(f"\n  validate_key (invalid): {stats['ops_per_sec']:,} ops/sec")
 
-    def test_validate_key_multi_throughput(self):
+    def test_validate_key_multi_throughput(self, valid_key):
         """Multi-key validation with keyring should exceed 5K ops/sec."""
-        stats = _bench(lambda: validate_key_multi(self.valid_key, HMAC_KEYS))
+        stats = _bench(lambda: validate_key_multi(valid_key, HMAC_KEYS))
         assert stats["ops_per_sec"] > 5_000
         print(f"\n  validate_key_multi: {stats['ops_per_sec']:,} ops/sec, "
               f"avg={stats['avg_ms']:.4f}ms")
@@ -115,8 +126,8 @@ class TestValidationBenchmarks:
 class TestLeaseBenchmarks:
     """Benchmark lease creation and verification."""
 
-    @staticmethod
-    def _make_payload():
+    @pytest.fixture(scope="class")
+    def payload(self):
         from vinzy_engine.keygen.lease import LeasePayload
         from datetime import datetime, timezone, timedelta
         now = datetime.now(timezone.utc)
@@ -131,29 +142,28 @@ class TestLeaseBenchmarks:
             expires_at=(now + timedelta(days=365)).isoformat(),
         )
 
-    def test_create_lease_throughput(self):
+    @pytest.fixture(scope="class")
+    def lease(self, payload):
+        return create_lease(payload, HMAC_KEY, ttl_seconds=3600)
+
+    def test_create_lease_throughput(self, payload):
         """Lease creation should exceed 5K ops/sec."""
-        payload = self._make_payload()
         stats = _bench(lambda: create_lease(payload, HMAC_KEY, ttl_seconds=3600))
         assert stats["ops_per_sec"] > 5_000
         print(f"\n  create_lease: {stats['ops_per_sec']:,} ops/sec, "
               f"avg={stats['avg_ms']:.4f}ms")
 
-    def test_verify_lease_throughput(self):
+    def test_verify_lease_throughput(self, lease):
         """Lease verification should exceed 10K ops/sec."""
-        payload = self._make_payload()
-        lease = create_lease(payload, HMAC_KEY, ttl_seconds=3600)
         stats = _bench(lambda: verify_lease(lease, HMAC_KEY))
         assert stats["ops_per_sec"] > 10_000
         print(f"\n  verify_lease: {stats['ops_per_sec']:,} ops/sec, "
               f"avg={stats['avg_ms']:.4f}ms")
 
-    def test_verify_invalid_lease_throughput(self):
+    def test_verify_invalid_lease_throughput(self, lease):
         """Invalid lease rejection should be fast."""
-        payload = self._make_payload()
-        lease = create_lease(payload, HMAC_KEY, ttl_seconds=3600)
-        lease["signature"] = "tampered"
-        stats = _bench(lambda: verify_lease(lease, HMAC_KEY))
+        tampered = {**lease, "signature": "tampered"}
+        stats = _bench(lambda: verify_lease(tampered, HMAC_KEY))
         assert stats["ops_per_sec"] > 10_000
         print(f"\n  verify_lease (invalid): {stats['ops_per_sec']:,} ops/sec")
 
@@ -166,22 +176,14 @@ class TestLeaseBenchmarks:
 class TestDatabaseBenchmarks:
     """Benchmark database-backed operations."""
 
-    async def test_license_creation_throughput(self, client, admin_headers):
+    async def test_license_creation_throughput(self, client, admin_headers, seed):
         """License creation via API."""
-        # Setup: create product + customer
-        await client.post(
-            "/products",
-            json={"code": "BEN", "name": "Bench Product"},
-            headers=admin_headers,
-        )
-        await client.post(
-            "/customers",
-            json={"name": "Bench User", "email": "bench@test.com"},
-            headers=admin_headers,
+        # Setup outside the timed loop: product + customer via the service layer
+        _, customer = await seed.product_and_customer(
+            product={"code": "BEN", "name": "Bench Product"},
+            customer={"name": "Bench User", "email": "bench@test.com"},
         )
-        resp = await client.get("/customers", headers=admin_headers)
-        customers = resp.json()
-        customer_id = customers[0]["id"]
+        customer_id = customer["id"]
 
         timings = []
         for i in range(50):
@@ -199,7 +201,7 @@ class TestDatabaseBenchmarks:
             assert resp.status_code == 201
 
         avg = statistics.mean(timings)
-        p99 = sorted(timings)[int(len(timings) * 0.99)]
+        p99 = statistics.quantiles(timings, n=100)[98]
         print(f"\n  license creation API: avg={avg:.1f}ms, p99={p99:.1f}ms")
         assert avg < 100, f"License creation too slow: {avg:.1f}ms avg"
 
@@ -215,7 +217,7 @@ class TestDatabaseBenchmarks:
             timings.append((time.perf_counter() - start) * 1000)
 
         avg = statistics.mean(timings)
-        p99 = sorted(timings)[int(len(timings) * 0.99)]
+        p99 = statistics.quantiles(timings, n=100)[98]
         print(f"\n  validation API: avg={avg:.1f}ms, p99={p99:.1f}ms")
         assert avg < 50, f"Validation API too slow: {avg:.1f}ms avg"
 
@@ -228,13 +230,16 @@ class TestDatabaseBenchmarks:
 class TestAnomalyBenchmarks:
     """Benchmark anomaly detection z-score calculations."""
 
-    def test_zscore_computation_throughput(self):
+    @pytest.fixture(scope="class")
+    def history(self):
+        return [float(50 + i % 20) for i in range(100)]
+
+    def test_zscore_computation_throughput(self, history):
         """Z-score anomaly detection should be fast."""
         from vinzy_engine.anomaly.detector import compute_z_score, compute_baseline
 
         # compute_baseline returns (mean, stddev) tuple
-        values = [float(50 + i % 20) for i in range(100)]
-        mean, stddev = compute_baseline(values)
+        mean, stddev = compute_baseline(history)
 
         stats = _bench(
             lambda: compute_z_score(150.0, mean, stddev),
@@ -244,14 +249,12 @@ class TestAnomalyBenchmarks:
         print(f"\n  z-score check: {stats['ops_per_sec']:,} ops/sec, "
               f"avg={stats['avg_ms']:.4f}ms")
 
-    def test_detect_anomalies_throughput(self):
+    def test_detect_anomalies_throughput(self, history):
         """Full anomaly detection pipeline throughput."""
         from vinzy_engine.anomaly.detector import detect_anomalies
 
-        values = [float(50 + i % 20) for i in range(100)]
-
         stats = _bench(
-            lambda: detect_anomalies(150.0, values, "tokens"),
+            lambda: detect_anomalies(150.0, history, "tokens"),
             iterations=BENCH_ITERATIONS,
         )
         assert stats["ops_per_sec"] > 10_000
@@ -3,7 +3,6 @@
 import pytest
 
 from vinzy_engine.common.config import VinzySettings
-from vinzy_engine.common.database import DatabaseManager
 from vinzy_engine.common.exceptions import ActivationLimitError, LicenseNotFoundError
 from vinzy_engine.activation.service import ActivationService
 from vinzy_engine.licensing.service import LicensingService
@@ -18,44 +17,48 @@ def make_settings(**overrides) -> VinzySettings:
     return VinzySettings(**defaults)
 
 
-@pytest.fixture
-async def db():
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
+@pytest.fixture(scope="module")
+def settings():
+    return make_settings()
 
 
-@pytest.fixture
-def svc():
-    settings = make_settings()
-    licensing = LicensingService(settings)
-    return ActivationService(settings, licensing)
+@pytest.fixture(scope="module")
+def licensing_svc(settings):
+    return LicensingService(settings)
 
 
-@pytest.fixture
-def licensing_svc():
-    return LicensingService(make_settings())
+@pytest.fixture(scope="module")
+def svc(settings, licensing_svc):
+    return ActivationService(settings, licensing_svc)
 
 
-async def _create_license(db, licensing_svc, machines_limit=3):
-    async with db.get_session() as session:
+@pytest.fixture(scope="module")
+async def customer_id(service_db, licensing_svc):
+    """Product ``ZUL`` and one customer, created once for the module."""
+    async with service_db.get_session() as session:
         await licensing_svc.create_product(session, "ZUL", "Zuultimate")
         customer = await licensing_svc.create_customer(
             session, "Test", "test@example.com"
         )
+    return customer.id
+
+
+async def _create_license(db, licensing_svc, customer_id, machines_limit=3):
     async with db.get_session() as session:
-        lic, raw_key = await licensing_svc.create_license(
-            session, "ZUL", customer.id, machines_limit=machines_limit
+        _, raw_key = await licensing_svc.create_license(
+            session, "ZUL", customer_id, machines_limit=machines_limit
         )
-    return lic, raw_key
+    return raw_key
+
+
+@pytest.fixture
+async def raw_key(db, licensing_svc, customer_id):
+    """Key of a fresh 3-machine license, rolled back with the test."""
+    return await _create_license(db, licensing_svc, customer_id)
 
 
 class TestActivation:
-    async def test_activate_success(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_activate_success(self, db, svc, raw_key):
         async with db.get_session() as session:
             result = await svc.activate(
                 session, raw_key, "fingerprint-1", hostname="host1"
@@ -64,24 +67,22 @@ class TestActivation:
             assert result["code"] == "ACTIVATED"
             assert result["machine_id"] is not None
 
-    async def test_activate_already_activated(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_activate_already_activated(self, db, svc, raw_key):
         async with db.get_session() as session:
             await svc.activate(session, raw_key, "fp-1")
         async with db.get_session() as session:
             result = await svc.activate(session, raw_key, "fp-1")
             assert result["code"] == "ALREADY_ACTIVATED"
 
-    async def test_activate_limit_reached(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc, machines_limit=1)
+    async def test_activate_limit_reached(self, db, svc, licensing_svc, customer_id):
+        raw_key = await _create_license(db, licensing_svc, customer_id, machines_limit=1)
         async with db.get_session() as session:
             await svc.activate(session, raw_key, "fp-1")
         with pytest.raises(ActivationLimitError):
             async with db.get_session() as session:
                 await svc.activate(session, raw_key, "fp-2")
 
-    async def test_activate_increments_machines_used(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_activate_increments_machines_used(self, db, svc, licensing_svc, raw_key):
         async with db.get_session() as session:
             await svc.activate(session, raw_key, "fp-1")
         async with db.get_session() as session:
@@ -90,16 +91,14 @@ class TestActivation:
 
 
 class TestDeactivation:
-    async def test_deactivate_success(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_deactivate_success(self, db, svc, raw_key):
         async with db.get_session() as session:
             await svc.activate(session, raw_key, "fp-1")
         async with db.get_session() as session:
             result = await svc.deactivate(session, raw_key, "fp-1")
             assert result is True
 
-    async def test_deactivate_decrements_machines_used(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_deactivate_decrements_machines_used(self, db, svc, licensing_svc, raw_key):
         async with db.get_session() as session:
             await svc.activate(session, raw_key, "fp-1")
         async with db.get_session() as session:
@@ -108,34 +107,31 @@ class TestDeactivation:
             found = await licensing_svc.get_license_by_key(session, raw_key)
             assert found.machines_used == 0
 
-    async def test_deactivate_nonexistent(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_deactivate_nonexistent(self, db, svc, raw_key):
         async with db.get_session() as session:
             result = await svc.deactivate(session, raw_key, "no-such-fp")
             assert result is False
 
-    async def test_deactivate_bad_key(self, db, svc, licensing_svc):
+    async def test_deactivate_bad_key(self, db, svc):
         with pytest.raises(LicenseNotFoundError):
             async with db.get_session() as session:
                 await svc.deactivate(session, "no-such-key", "fp-1")
 
 
 class TestHeartbeat:
-    async def test_heartbeat_success(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_heartbeat_success(self, db, svc, raw_key):
         async with db.get_session() as session:
             await svc.activate(session, raw_key, "fp-1")
         async with db.get_session() as session:
             result = await svc.heartbeat(session, raw_key, "fp-1", version="1.0")
             assert result is True
 
-    async def test_heartbeat_not_activated(self, db, svc, licensing_svc):
-        lic, raw_key = await _create_license(db, licensing_svc)
+    async def test_heartbeat_not_activated(self, db, svc, raw_key):
         async with db.get_session() as session:
             result = await svc.heartbeat(session, raw_key, "fp-1")
             assert result is False
 
-    async def test_heartbeat_bad_key(self, db, svc, licensing_svc):
+    async def test_heartbeat_bad_key(self, db, svc):
         with pytest.raises(LicenseNotFoundError):
             async with db.get_session() as session:
                 await svc.heartbeat(session, "bad-key", "fp-1")
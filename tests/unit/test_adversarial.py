@@ -1,5 +1,7 @@
 """Adversarial tests — security, forgery, tampering, edge cases."""
 
+import re
+
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
@@ -19,6 +21,18 @@ HMAC_KEY = "test-hmac-key-for-unit-tests"
 WRONG_KEY = "completely-wrong-hmac-key"
 
 
+@pytest.fixture(scope="module")
+def valid_key():
+    """One validly signed key, shared by tests that only read it."""
+    return generate_key("ZUL", HMAC_KEY)
+
+
+@pytest.fixture(scope="module")
+def valid_parts(valid_key):
+    """Segments of ``valid_key``; a tuple so tamper cases must copy it."""
+    return tuple(valid_key.split("-"))
+
+
 # ── Key Forgery ──
 
 
@@ -41,48 +55,49 @@ class TestKeyForgery:
 class TestHmacTruncation:
     def test_no_accidental_verification(self):
         """1000 random keys must never accidentally verify (statistical)."""
-        false_positives = 0
-        for _ in range(1000):
-            key = generate_key("ZUL", WRONG_KEY)
-            if verify_hmac(key, HMAC_KEY):
-                false_positives += 1
+        forged = (generate_key("ZUL", WRONG_KEY) for _ in range(1000))
         # With 50 bits of HMAC, probability of collision is ~1/2^50 per try
-        assert false_positives == 0
+        assert not any(verify_hmac(key, HMAC_KEY) for key in forged)
 
 
 # ── Tampered Keys ──
 
 
+def _flip(parts: tuple[str, ...], seg_idx: int, pos: int) -> str:
+    seg = list(parts[seg_idx])
+    seg[pos] = "A" if seg[pos] != "A" else "B"
+    tampered = list(parts)
+    tampered[seg_idx] = "".join(seg)
+    return "-".join(tampered)
+
+
 class TestTamperedKeys:
-    def test_flip_char_in_random_segment(self):
+    @pytest.mark.parametrize("seg_idx", [1, 2, 3, 4, 5])  # random segments
+    def test_flip_char_in_random_segment(self, valid_parts, seg_idx):
         """Flipping a character in any random segment invalidates the key."""
-        key = generate_key("ZUL", HMAC_KEY)
-        parts = key.split("-")
-        for seg_idx in range(1, 6):  # segments 1-5 are random
-            seg = list(parts[seg_idx])
-            original_char = seg[2]
-            seg[2] = "A" if original_char != "A" else "B"
-            tampered_parts = parts.copy()
-            tampered_parts[seg_idx] = "".join(seg)
-            tampered = "-".join(tampered_parts)
-            assert verify_hmac(tampered, HMAC_KEY) is False, f"Segment {seg_idx} tamper not detected"
-
-    def test_flip_char_in_hmac_segment(self):
+        assert verify_hmac(_flip(valid_parts, seg_idx, 2), HMAC_KEY) is False
+
+    @pytest.mark.parametrize("seg_idx", [6, 7])  # HMAC segments
+    def test_flip_char_in_hmac_segment(self, valid_parts, seg_idx):
         """Flipping a character in either HMAC segment invalidates the key."""
-        key = generate_key("ZUL", HMAC_KEY)
-        parts = key.split("-")
-        for seg_idx in (6, 7):  # HMAC segments
-            seg = list(parts[seg_idx])
-            seg[0] = "A" if seg[0] != "A" else "B"
-            tampered_parts = parts.copy()
-            tampered_parts[seg_idx] = "".join(seg)
-            tampered = "-".join(tampered_parts)
-            assert verify_hmac(tampered, HMAC_KEY) is False, f"HMAC segment {seg_idx} tamper not detected"
-
-    def test_swap_random_segments(self):
+        assert verify_hmac(_flip(valid_parts, seg_idx, 0), HMAC_KEY) is False
+
+    @pytest.mark.parametrize("seg_idx", [1, 7])
+    def test_signature_compared_in_constant_time(self, valid_key, valid_parts, seg_idx):
+        """Signature checks go through hmac.compare_digest, never ``==``."""
+        import hmac
+
+        with patch(
+            "vinzy_engine.keygen.generator.hmac.compare_digest",
+            wraps=hmac.compare_digest,
+        ) as compare:
+            assert verify_hmac(valid_key, HMAC_KEY) is True
+            assert verify_hmac(_flip(valid_parts, seg_idx, 0), HMAC_KEY) is False
+        assert compare.call_count == 2
+
+    def test_swap_random_segments(self, valid_parts):
         """Swapping two random segments invalidates the key."""
-        key = generate_key("ZUL", HMAC_KEY)
-        parts = key.split("-")
+        parts = list(valid_parts)
         # Swap segments 1 and 3
         parts[1], parts[3] = parts[3], parts[1]
         tampered = "-".join(parts)
@@ -93,129 +108,113 @@ class TestTamperedKeys:
 
 
 class TestClockManipulation:
-    async def test_expired_license_rejected(self):
+    async def test_expired_license_rejected(self, db):
         """An expired license is rejected via mocked datetime."""
         from vinzy_engine.common.config import VinzySettings
-        from vinzy_engine.common.database import DatabaseManager
         from vinzy_engine.common.exceptions import LicenseExpiredError
         from vinzy_engine.licensing.service import LicensingService
 
         settings = VinzySettings(hmac_key=HMAC_KEY, db_url="sqlite+aiosqlite://")
-        manager = DatabaseManager(settings)
-        await manager.init()
-        await manager.create_all()
-
         svc = LicensingService(settings)
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             await svc.create_product(session, "ZUL", "Zuultimate")
             customer = await svc.create_customer(session, "T", "t@t.com")
 
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             lic, raw_key = await svc.create_license(
                 session, "ZUL", customer.id, days_valid=1
             )
 
         # Fast-forward: set license expiry to the past
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             lic_obj = await svc.get_license_by_key(session, raw_key)
             lic_obj.expires_at = datetime.now(timezone.utc) - timedelta(days=1)
             await session.flush()
 
         with pytest.raises(LicenseExpiredError):
-            async with manager.get_session() as session:
+            async with db.get_session() as session:
                 await svc.validate_license(session, raw_key)
 
-        await manager.close()
-
 
 # ── Activation Limit Bypass ──
 
 
 class TestActivationLimitBypass:
-    async def test_concurrent_activations_respect_limit(self):
+    async def test_concurrent_activations_respect_limit(self, db):
         """Activating more machines than allowed must fail."""
         from vinzy_engine.common.config import VinzySettings
-        from vinzy_engine.common.database import DatabaseManager
         from vinzy_engine.common.exceptions import ActivationLimitError
         from vinzy_engine.activation.service import ActivationService
         from vinzy_engine.licensing.service import LicensingService
 
         settings = VinzySettings(hmac_key=HMAC_KEY, db_url="sqlite+aiosqlite://")
-        manager = DatabaseManager(settings)
-        await manager.init()
-        await manager.create_all()
-
         lic_svc = LicensingService(settings)
         act_svc = ActivationService(settings, lic_svc)
 
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             await lic_svc.create_product(session, "ZUL", "Zuultimate")
             customer = await lic_svc.create_customer(session, "T", "t@t.com")
 
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             _, raw_key = await lic_svc.create_license(
                 session, "ZUL", customer.id, machines_limit=1
             )
 
         # First activation succeeds
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             result = await act_svc.activate(session, raw_key, "fp-1")
             assert result["success"] is True
 
         # Second activation must fail
         with pytest.raises(ActivationLimitError):
-            async with manager.get_session() as session:
+            async with db.get_session() as session:
                 await act_svc.activate(session, raw_key, "fp-2")
 
-        await manager.close()
-
 
 # ── Fingerprint Replay ──
 
 
 class TestFingerprintReplay:
-    async def test_same_fingerprint_independent_licenses(self):
+    async def test_same_fingerprint_independent_licenses(self, db):
         """Same fingerprint works independently across different licenses."""
         from vinzy_engine.common.config import VinzySettings
-        from vinzy_engine.common.database import DatabaseManager
         from vinzy_engine.activation.service import ActivationService
         from vinzy_engine.licensing.service import LicensingService
 
         settings = VinzySettings(hmac_key=HMAC_KEY, db_url="sqlite+aiosqlite://")
-        manager = DatabaseManager(settings)
-        await manager.init()
-        await manager.create_all()
-
         lic_svc = LicensingService(settings)
         act_svc = ActivationService(settings, lic_svc)
 
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             await lic_svc.create_product(session, "ZUL", "Zuultimate")
             c1 = await lic_svc.create_customer(session, "A", "a@a.com")
             c2 = await lic_svc.create_customer(session, "B", "b@b.com")
 
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             _, key1 = await lic_svc.create_license(session, "ZUL", c1.id)
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             _, key2 = await lic_svc.create_license(session, "ZUL", c2.id)
 
         # Same fingerprint on two different licenses
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             r1 = await act_svc.activate(session, key1, "same-fp")
             assert r1["success"] is True
-        async with manager.get_session() as session:
+        async with db.get_session() as session:
             r2 = await act_svc.activate(session, key2, "same-fp")
             assert r2["success"] is True
 
-        await manager.close()
-
 
 # ── Admin Endpoint Auth ──
 
 
 class TestAdminEndpointAuth:
-    async def test_create_product_no_auth(self, client):
-        resp = await client.post("/products", json={"code": "ZUL", "name": "Z"})
+    @pytest.mark.parametrize(("method", "path", "body"), [
+        ("POST", "/products", {"code": "ZUL", "name": "Z"}),
+        ("GET", "/licenses", None),
+        ("GET", "/usage/some-id", None),
+    ], ids=["create-product", "list-licenses", "get-usage"])
+    async def test_missing_api_key_rejected(self, client, method, path, body):
+        resp = await client.request(method, path, json=body)
         assert resp.status_code == 422
 
     async def test_create_product_wrong_auth(self, client):
@@ -226,14 +225,6 @@ class TestAdminEndpointAuth:
         )
         assert resp.status_code == 403
 
-    async def test_list_licenses_no_auth(self, client):
-        resp = await client.get("/licenses")
-        assert resp.status_code == 422
-
-    async def test_get_usage_no_auth(self, client):
-        resp = await client.get("/usage/some-id")
-        assert resp.status_code == 422
-
     async def test_validate_no_auth_ok(self, client):
         resp = await client.get("/validate", params={"key": "any"})
         assert resp.status_code == 200
@@ -256,16 +247,12 @@ class TestSqlInjection:
 
 
 class TestKeyEnumeration:
-    def test_different_keys_different_hashes(self):
-        k1 = generate_key("ZUL", HMAC_KEY)
-        k2 = generate_key("ZUL", HMAC_KEY)
-        assert key_hash(k1) != key_hash(k2)
+    def test_different_keys_different_hashes(self, valid_key):
+        assert key_hash(valid_key) != key_hash(generate_key("ZUL", HMAC_KEY))
 
-    def test_hash_is_64_char_hex(self):
-        key = generate_key("ZUL", HMAC_KEY)
-        h = key_hash(key)
-        assert len(h) == 64
-        assert all(c in "0123456789abcdef" for c in h)
+    def test_hash_is_64_char_hex(self, valid_key):
+        h = key_hash(valid_key)
+        assert re.fullmatch(r"[0-9a-f]{64}", h)
 
 
 # ── Lease Forgery ──
@@ -294,14 +281,14 @@ class TestLeaseForgery:
         lease["signature"] = "f" * 64
         assert verify_lease(lease, HMAC_KEY) is False
 
-    def test_expired_lease_rejected(self):
+    def test_expired_lease_rejected(self, monkeypatch):
         payload = LeasePayload(
             license_id="lic-1", status="active", features=[],
             entitlements=[], tier="standard", product_code="ZUL",
             issued_at=datetime.now(timezone.utc).isoformat(),
             expires_at="2027-01-01T00:00:00+00:00",
         )
-        lease = create_lease(payload, HMAC_KEY, ttl_seconds=0)
-        import time
-        time.sleep(0.01)
+        lease = create_lease(payload, HMAC_KEY, ttl_seconds=60)
+        later = datetime.now(timezone.utc) + timedelta(seconds=61)
+        monkeypatch.setattr("vinzy_engine.keygen.lease._now", lambda: later)
         assert verify_lease(lease, HMAC_KEY) is False
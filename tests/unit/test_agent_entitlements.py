@@ -1,7 +1,5 @@
 """Tests for agent-specific entitlement resolution."""
 
-import pytest
-
 from vinzy_engine.licensing.agent_entitlements import (
     AgentEntitlement,
     get_agent_quota,
@@ -3,7 +3,6 @@
 import pytest
 
 from vinzy_engine.common.config import VinzySettings
-from vinzy_engine.common.database import DatabaseManager
 from vinzy_engine.licensing.service import LicensingService
 from vinzy_engine.usage.service import UsageService
 from vinzy_engine.usage.agent_usage import (
@@ -71,24 +70,19 @@ class TestCheckAgentQuota:
 
 # Service-level test with real DB
 
-@pytest.fixture
-async def db():
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
+@pytest.fixture(scope="module")
+def settings():
+    return make_settings()
 
 
-@pytest.fixture
-def licensing_svc():
-    return LicensingService(make_settings())
+@pytest.fixture(scope="module")
+def licensing_svc(settings):
+    return LicensingService(settings)
 
 
-@pytest.fixture
-def svc(licensing_svc):
-    return UsageService(make_settings(), licensing_svc)
+@pytest.fixture(scope="module")
+def svc(settings, licensing_svc):
+    return UsageService(settings, licensing_svc)
 
 
 async def _create_license(db, licensing_svc):
@@ -109,13 +103,12 @@ class TestGetAgentUsageSummary:
         lic, raw_key = await _create_license(db, licensing_svc)
         # Record some agent-prefixed usage
         async with db.get_session() as session:
-            await svc.record_usage(session, raw_key, "agent.CTO.tokens", 3000)
-        async with db.get_session() as session:
-            await svc.record_usage(session, raw_key, "agent.CTO.tokens", 2000)
-        async with db.get_session() as session:
-            await svc.record_usage(session, raw_key, "agent.CFO.delegations", 5)
-        async with db.get_session() as session:
-            await svc.record_usage(session, raw_key, "api_calls", 10)  # not agent
+            await svc.record_usage_batch(session, raw_key, [
+                {"metric": "agent.CTO.tokens", "value": 3000},
+                {"metric": "agent.CTO.tokens", "value": 2000},
+                {"metric": "agent.CFO.delegations", "value": 5},
+                {"metric": "api_calls", "value": 10},  # not agent
+            ])
         async with db.get_session() as session:
             summary = await svc.get_agent_usage_summary(session, lic.id)
             assert "CTO" in summary
@@ -3,7 +3,6 @@
 import pytest
 
 from vinzy_engine.common.config import VinzySettings
-from vinzy_engine.common.database import DatabaseManager
 from vinzy_engine.anomaly.detector import (
     compute_baseline,
     compute_z_score,
@@ -25,55 +24,57 @@ def make_settings(**overrides) -> VinzySettings:
     return VinzySettings(**defaults)
 
 
-@pytest.fixture
-async def db():
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
+@pytest.fixture(scope="module")
+def settings():
+    return make_settings()
 
 
-@pytest.fixture
-def audit_svc():
-    return AuditService(make_settings())
+@pytest.fixture(scope="module")
+def audit_svc(settings):
+    return AuditService(settings)
 
 
-@pytest.fixture
-def anomaly_svc(audit_svc):
-    return AnomalyService(make_settings(), audit_service=audit_svc)
+@pytest.fixture(scope="module")
+def anomaly_svc(settings, audit_svc):
+    return AnomalyService(settings, audit_service=audit_svc)
 
 
-@pytest.fixture
-def licensing_svc():
-    return LicensingService(make_settings())
+@pytest.fixture(scope="module")
+def licensing_svc(settings):
+    return LicensingService(settings)
 
 
-@pytest.fixture
-def usage_svc(licensing_svc, audit_svc, anomaly_svc):
+@pytest.fixture(scope="module")
+def usage_svc(settings, licensing_svc, audit_svc, anomaly_svc):
     return UsageService(
-        make_settings(), licensing_svc,
+        settings, licensing_svc,
         audit_service=audit_svc, anomaly_service=anomaly_svc,
     )
 
 
-async def _create_license_with_usage(db, licensing_svc, usage_svc, metric, values):
-    """Helper: create a license and record usage values for a metric."""
-    async with db.get_session() as session:
+@pytest.fixture(scope="module")
+async def license_and_key(service_db, licensing_svc):
+    """One license for the module; each test's usage and anomalies roll back."""
+    async with service_db.get_session() as session:
         await licensing_svc.create_product(session, "ZUL", "Zuultimate")
         customer = await licensing_svc.create_customer(
             session, "Test", "test@example.com"
         )
+        return await licensing_svc.create_license(session, "ZUL", customer.id)
+
+
+async def _record_history(db, usage_svc, raw_key, metric, values):
+    """Record baseline usage values for a metric in one session."""
     async with db.get_session() as session:
-        lic, raw_key = await licensing_svc.create_license(
-            session, "ZUL", customer.id
-        )
-    # Record baseline usage
-    for v in values:
-        async with db.get_session() as session:
-            await usage_svc.record_usage(session, raw_key, metric, v)
-    return lic, raw_key
+        await usage_svc.record_usage_many(session, raw_key, metric, values)
+
+
+@pytest.fixture
+async def steady_license(db, usage_svc, license_and_key):
+    """The module license with ten ``api_calls`` readings of 10.0."""
+    lic, raw_key = license_and_key
+    await _record_history(db, usage_svc, raw_key, "api_calls", [10.0] * 10)
+    return lic
 
 
 # ── Detector unit tests ──────────────────────────────────────────
@@ -172,13 +173,9 @@ class TestDetectAnomalies:
 
 
 class TestAnomalyService:
-    async def test_scan_and_record_creates_anomaly(self, db, licensing_svc, usage_svc, anomaly_svc):
+    async def test_scan_and_record_creates_anomaly(self, db, anomaly_svc, steady_license):
         """A spike after normal usage should create an anomaly record."""
-        # Build baseline: 10 normal values
-        lic, raw_key = await _create_license_with_usage(
-            db, licensing_svc, usage_svc, "api_calls",
-            [10.0] * 10,
-        )
+        lic = steady_license
         # Now scan a big spike
         async with db.get_session() as session:
             anomaly = await anomaly_svc.scan_and_record(
@@ -190,11 +187,11 @@ class TestAnomalyService:
             assert anomaly.license_id == lic.id
             assert anomaly.resolved is False
 
-    async def test_scan_normal_returns_none(self, db, licensing_svc, usage_svc, anomaly_svc):
+    async def test_scan_normal_returns_none(self, db, usage_svc, anomaly_svc, license_and_key):
         """A value within normal range should not create an anomaly."""
-        lic, raw_key = await _create_license_with_usage(
-            db, licensing_svc, usage_svc, "api_calls",
-            [10.0, 11.0, 10.0, 12.0, 10.0],
+        lic, raw_key = license_and_key
+        await _record_history(
+            db, usage_svc, raw_key, "api_calls", [10.0, 11.0, 10.0, 12.0, 10.0],
         )
         async with db.get_session() as session:
             anomaly = await anomaly_svc.scan_and_record(
@@ -202,12 +199,9 @@ class TestAnomalyService:
             )
             assert anomaly is None
 
-    async def test_get_anomalies(self, db, licensing_svc, usage_svc, anomaly_svc):
+    async def test_get_anomalies(self, db, anomaly_svc, steady_license):
         """List anomalies for a license."""
-        lic, raw_key = await _create_license_with_usage(
-            db, licensing_svc, usage_svc, "api_calls",
-            [10.0] * 10,
-        )
+        lic = steady_license
         async with db.get_session() as session:
             await anomaly_svc.scan_and_record(session, lic.id, "api_calls", 100.0)
         async with db.get_session() as session:
@@ -215,12 +209,9 @@ class TestAnomalyService:
             assert len(anomalies) == 1
             assert anomalies[0].severity in ("critical", "high")
 
-    async def test_resolve_anomaly(self, db, licensing_svc, usage_svc, anomaly_svc):
+    async def test_resolve_anomaly(self, db, anomaly_svc, steady_license):
         """Resolve a detected anomaly."""
-        lic, raw_key = await _create_license_with_usage(
-            db, licensing_svc, usage_svc, "api_calls",
-            [10.0] * 10,
-        )
+        lic = steady_license
         async with db.get_session() as session:
             anomaly = await anomaly_svc.scan_and_record(session, lic.id, "api_calls", 100.0)
             anomaly_id = anomaly.id
@@ -237,12 +228,9 @@ class TestAnomalyService:
             result = await anomaly_svc.resolve_anomaly(session, "fake-id", "admin")
             assert result is None
 
-    async def test_get_anomalies_filter_severity(self, db, licensing_svc, usage_svc, anomaly_svc):
+    async def test_get_anomalies_filter_severity(self, db, anomaly_svc, steady_license):
         """Filter anomalies by severity."""
-        lic, raw_key = await _create_license_with_usage(
-            db, licensing_svc, usage_svc, "api_calls",
-            [10.0] * 10,
-        )
+        lic = steady_license
         async with db.get_session() as session:
             await anomaly_svc.scan_and_record(session, lic.id, "api_calls", 100.0)
         async with db.get_session() as session:
@@ -255,12 +243,9 @@ class TestAnomalyService:
             if all_found[0].severity == "critical":
                 assert len(none_found) == 0
 
-    async def test_get_anomalies_filter_resolved(self, db, licensing_svc, usage_svc, anomaly_svc):
+    async def test_get_anomalies_filter_resolved(self, db, anomaly_svc, steady_license):
         """Filter anomalies by resolved status."""
-        lic, raw_key = await _create_license_with_usage(
-            db, licensing_svc, usage_svc, "api_calls",
-            [10.0] * 10,
-        )
+        lic = steady_license
         async with db.get_session() as session:
             anomaly = await anomaly_svc.scan_and_record(session, lic.id, "api_calls", 100.0)
             anomaly_id = anomaly.id
@@ -1,9 +1,10 @@
 """Tests for the cryptographic audit chain service."""
 
+from unittest.mock import patch
+
 import pytest
 
 from vinzy_engine.common.config import VinzySettings
-from vinzy_engine.common.database import DatabaseManager
 from vinzy_engine.audit.service import AuditService
 from vinzy_engine.licensing.service import LicensingService
 
@@ -17,24 +18,19 @@ def make_settings(**overrides) -> VinzySettings:
     return VinzySettings(**defaults)
 
 
-@pytest.fixture
-async def db():
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
+@pytest.fixture(scope="module")
+def settings():
+    return make_settings()
 
 
-@pytest.fixture
-def audit_svc():
-    return AuditService(make_settings())
+@pytest.fixture(scope="module")
+def audit_svc(settings):
+    return AuditService(settings)
 
 
-@pytest.fixture
-def licensing_svc():
-    return LicensingService(make_settings())
+@pytest.fixture(scope="module")
+def licensing_svc(settings):
+    return LicensingService(settings)
 
 
 async def _create_license(db, licensing_svc):
@@ -83,6 +79,13 @@ class TestRecordEvent:
         h2 = AuditService._compute_event_hash("license.created", "system", {}, None)
         assert h1 == h2
 
+    def test_event_hash_canonical_form_is_stable(self):
+        """Stored chains depend on the exact bytes hashed; pin them."""
+        h = AuditService._compute_event_hash(
+            "license.created", "system", {"note": "caf\u00e9", "n": 1.5}, None,
+        )
+        assert h == "ae5567c6838504cc6e2b5e50dc2d8bec28ff2d32df5917110fac784ed9bba502"
+
     async def test_signature_uses_hmac(self, db, audit_svc, licensing_svc):
         lic, _ = await _create_license(db, licensing_svc)
         async with db.get_session() as session:
@@ -91,6 +94,23 @@ class TestRecordEvent:
             )
             assert len(event.signature) == 64  # SHA-256 hex digest
 
+    async def test_off_mode_records_nothing(self, db, licensing_svc):
+        svc = AuditService(make_settings(audit_chain_mode="off"))
+        lic, _ = await _create_license(db, licensing_svc)
+        async with db.get_session() as session:
+            event = await svc.record_event(session, lic.id, "license.created")
+            assert event is None
+        async with db.get_session() as session:
+            assert await svc.get_chain_head(session, lic.id) is None
+
+    def test_off_mode_rejected_outside_development(self):
+        settings = make_settings(
+            audit_chain_mode="off", environment="production",
+            secret_key="s" * 32, api_key="a" * 32, super_admin_key="b" * 32,
+        )
+        with pytest.raises(RuntimeError, match="AUDIT_CHAIN_MODE"):
+            settings.validate_for_production()
+
 
 class TestVerifyChain:
     async def test_verify_intact_chain(self, db, audit_svc, licensing_svc):
@@ -125,6 +145,30 @@ class TestVerifyChain:
             assert result["valid"] is True
             assert result["events_checked"] == 0
 
+    async def test_keyring_encoded_once_per_pass(self, db, audit_svc, licensing_svc):
+        lic, _ = await _create_license(db, licensing_svc)
+        async with db.get_session() as session:
+            await audit_svc.record_event(session, lic.id, "license.created", "system", {})
+            await audit_svc.record_event(session, lic.id, "license.validated", "system", {})
+        with patch.object(
+            audit_svc, "_keyring_bytes", wraps=audit_svc._keyring_bytes,
+        ) as mock_keyring:
+            async with db.get_session() as session:
+                result = await audit_svc.verify_chain(session, lic.id)
+        assert result["valid"] is True
+        assert result["events_checked"] == 2
+        mock_keyring.assert_called_once()
+
+    async def test_rotated_out_key_fails_verification(self, db, licensing_svc):
+        lic, _ = await _create_license(db, licensing_svc)
+        old = AuditService(make_settings(hmac_keys='{"0": "old-key"}'))
+        async with db.get_session() as session:
+            await old.record_event(session, lic.id, "license.created", "system", {})
+        new = AuditService(make_settings(hmac_keys='{"1": "new-key"}'))
+        async with db.get_session() as session:
+            assert (await old.verify_chain(session, lic.id))["valid"] is True
+            assert (await new.verify_chain(session, lic.id))["valid"] is False
+
 
 class TestGetEvents:
     async def test_get_events_filtered(self, db, audit_svc, licensing_svc):
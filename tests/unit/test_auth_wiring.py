@@ -1,7 +1,5 @@
 """Tests for auth wiring — admin endpoints require API key, public endpoints don't."""
 
-import pytest
-
 
 class TestAdminEndpointsRequireAuth:
     async def test_create_product_no_auth(self, client):
@@ -37,6 +35,29 @@ class TestAdminEndpointsRequireAuth:
         assert resp.status_code == 403
 
 
+class TestKeyMatching:
+    def test_matching_key(self):
+        from vinzy_engine.common.security import _key_matches
+        assert _key_matches("test-admin-api-key", "test-admin-api-key") is True
+
+    def test_mismatched_key(self):
+        from vinzy_engine.common.security import _key_matches
+        assert _key_matches("wrong", "test-admin-api-key") is False
+        assert _key_matches("test-admin-api-key-extra", "test-admin-api-key") is False
+
+    def test_allowlist_parsed_once(self):
+        import ipaddress
+        from vinzy_engine.common.security import _allowlist_networks
+        _allowlist_networks.cache_clear()
+        nets = _allowlist_networks(("10.0.0.0/8", "not-a-network", "192.168.1.5"))
+        _allowlist_networks(("10.0.0.0/8", "not-a-network", "192.168.1.5"))
+        assert nets == (
+            ipaddress.ip_network("10.0.0.0/8"),
+            ipaddress.ip_network("192.168.1.5/32"),
+        )
+        assert _allowlist_networks.cache_info().hits == 1
+
+
 class TestPublicEndpointsWork:
     async def test_validate_no_auth(self, client):
         resp = await client.get("/validate", params={"key": "anything"})
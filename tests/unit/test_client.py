@@ -1,7 +1,6 @@
 """Tests for client.py — LicenseClient SDK with resilience."""
 
 import json
-import pytest
 from unittest.mock import MagicMock, patch, PropertyMock
 from datetime import datetime, timezone, timedelta
 
@@ -1,6 +1,5 @@
 """Tests for cross-product entitlement composition."""
 
-import pytest
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -0,0 +1,36 @@
+"""Tests for the async database manager and engine pool configuration."""
+
+from vinzy_engine.common.config import VinzySettings
+from vinzy_engine.common.database import DatabaseManager, _engine_kwargs
+
+
+def make_settings(**overrides) -> VinzySettings:
+    defaults = {"db_url": "sqlite+aiosqlite://"}
+    defaults.update(overrides)
+    return VinzySettings(**defaults)
+
+
+class TestEngineKwargs:
+    def test_in_memory_sqlite_skips_pool_sizing(self):
+        kwargs = _engine_kwargs(make_settings())
+        assert kwargs == {"pool_pre_ping": True, "pool_recycle": 3600}
+
+    def test_pooled_backend_gets_sizing(self):
+        kwargs = _engine_kwargs(make_settings(
+            db_url="postgresql+asyncpg://u:p@localhost/vinzy",
+            db_pool_size=5, db_max_overflow=2, db_pool_timeout=7,
+        ))
+        assert kwargs["pool_size"] == 5
+        assert kwargs["max_overflow"] == 2
+        assert kwargs["pool_timeout"] == 7
+        assert kwargs["pool_pre_ping"] is True
+
+    async def test_file_sqlite_engine_uses_sized_pool(self, tmp_path):
+        manager = DatabaseManager(make_settings(
+            db_url=f"sqlite+aiosqlite:///{tmp_path / 'vinzy.db'}", db_pool_size=4,
+        ))
+        await manager.init()
+        try:
+            assert manager.engine.pool.size() == 4
+        finally:
+            await manager.close()
@@ -1,6 +1,5 @@
 """Tests for IP allowlist middleware."""
 
-import pytest
 from starlette.testclient import TestClient
 
 
@@ -1,6 +1,6 @@
 """Tests for keygen.generator — key generation and HMAC signing."""
 
-import pytest
+import re
 
 from vinzy_engine.keygen.generator import (
     BASE32_ALPHABET,
@@ -13,6 +13,7 @@ from vinzy_engine.keygen.generator import (
     _random_segment,
     extract_version,
     generate_key,
+    hmac_for,
     key_hash,
     verify_hmac,
     verify_hmac_multi,
@@ -106,6 +107,25 @@ class TestVerifyHmac:
     def test_empty_key(self):
         assert verify_hmac("", HMAC_KEY) is False
 
+    def test_compute_hmac_matches_stdlib_hmac(self):
+        import base64
+        import hashlib
+        import hmac
+
+        fresh = hmac.new(HMAC_KEY.encode(), b"ZUL-ABCDE", hashlib.sha256).digest()
+        expected = base64.b32encode(fresh).decode()[:SEGMENT_LEN * HMAC_SEGMENTS]
+        assert _compute_hmac("ZUL", "ABCDE", HMAC_KEY) == expected
+
+    def test_hmac_for_returns_independent_objects(self):
+        import hashlib
+        import hmac
+
+        first = hmac_for(HMAC_KEY)
+        first.update(b"message")
+        second = hmac_for(HMAC_KEY)
+        assert second.digest() == hmac.new(HMAC_KEY.encode(), b"", hashlib.sha256).digest()
+        assert first.digest() == hmac.new(HMAC_KEY.encode(), b"message", hashlib.sha256).digest()
+
 
 class TestVersionEncoding:
     def test_encode_decode_roundtrip(self):
@@ -160,5 +180,4 @@ class TestKeyHash:
 
     def test_hex_string(self):
         h = key_hash("ZUL-AAAAA-BBBBB-CCCCC-DDDDD-EEEEE-FFFFF-GGGGG")
-        assert len(h) == 64
-        assert all(c in "0123456789abcdef" for c in h)
+        assert re.fullmatch(r"[0-9a-f]{64}", h)
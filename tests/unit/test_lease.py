@@ -1,8 +1,8 @@
 """Tests for keygen.lease — signed lease creation and verification."""
 
 import json
-import pytest
-from datetime import datetime, timezone
+import re
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 from vinzy_engine.keygen.lease import LeasePayload, create_lease, verify_lease
@@ -37,8 +37,7 @@ class TestCreateLease:
     def test_signature_is_hex(self):
         payload = _make_payload()
         lease = create_lease(payload, HMAC_KEY)
-        assert len(lease["signature"]) == 64
-        assert all(c in "0123456789abcdef" for c in lease["signature"])
+        assert re.fullmatch(r"[0-9a-f]{64}", lease["signature"])
 
     def test_deterministic_signature(self):
         """Same payload + key produces same signature."""
@@ -68,12 +67,11 @@ class TestVerifyLease:
         lease["signature"] = "a" * 64
         assert verify_lease(lease, HMAC_KEY) is False
 
-    def test_expired_lease_rejected(self):
+    def test_expired_lease_rejected(self, monkeypatch):
         payload = _make_payload()
-        lease = create_lease(payload, HMAC_KEY, ttl_seconds=0)
-        # ttl=0 means it expires immediately
-        import time
-        time.sleep(0.01)
+        lease = create_lease(payload, HMAC_KEY, ttl_seconds=60)
+        later = datetime.now(timezone.utc) + timedelta(seconds=61)
+        monkeypatch.setattr("vinzy_engine.keygen.lease._now", lambda: later)
         assert verify_lease(lease, HMAC_KEY) is False
 
     def test_wrong_key_rejected(self):
@@ -92,19 +92,6 @@ class TestResolveEntitlements:
 # ── Service with real DB ──
 
 
-@pytest.fixture
-async def db():
-    """In-memory SQLite database for service tests."""
-    from vinzy_engine.common.database import DatabaseManager
-
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
-
-
 @pytest.fixture
 def svc():
     return LicensingService(make_settings())
@@ -316,6 +303,18 @@ class TestGlobalUniqueness:
             tenant_lics, t_count = await svc.list_licenses(session, tenant_id=t1.id)
             assert t_count == 1
 
+    async def test_list_licenses_eager_loads_product(self, db, svc):
+        """Products ride along with the page, so callers never lazy-load."""
+        async with db.get_session() as session:
+            await svc.create_product(session, "ZUL", "Zuultimate")
+            c = await svc.create_customer(session, "C", "c@g.com")
+        async with db.get_session() as session:
+            await svc.create_license(session, "ZUL", c.id)
+        async with db.get_session() as session:
+            items, _ = await svc.list_licenses(session)
+        # Session is closed; an unloaded relationship would raise here
+        assert items[0].product.code == "ZUL"
+
 
 # ── Agent Entitlements via Validate ──
 
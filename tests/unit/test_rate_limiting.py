@@ -7,9 +7,17 @@ from unittest.mock import patch
 
 @pytest.fixture(autouse=True)
 def _rate_limit_env(monkeypatch):
+    from vinzy_engine.common.config import get_settings
+
     monkeypatch.setenv("VINZY_RATE_LIMIT_ENABLED", "true")
     monkeypatch.setenv("VINZY_RATE_LIMIT_PER_MINUTE", "60")
     monkeypatch.setenv("VINZY_RATE_LIMIT_PUBLIC_PER_MINUTE", "5")
+    # Limits are read from settings per request, so the shared app picks
+    # these up once the cache is cleared.
+    get_settings.cache_clear()
+    yield
+    monkeypatch.undo()
+    get_settings.cache_clear()
 
 
 class TestRateLimitingConfig:
@@ -3,7 +3,6 @@
 import pytest
 
 from vinzy_engine.common.config import VinzySettings
-from vinzy_engine.common.database import DatabaseManager
 from vinzy_engine.tenants.service import TenantService, _hash_api_key
 
 
@@ -16,16 +15,6 @@ def make_settings(**overrides) -> VinzySettings:
     return VinzySettings(**defaults)
 
 
-@pytest.fixture
-async def db():
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
-
-
 @pytest.fixture
 def svc():
     return TenantService()
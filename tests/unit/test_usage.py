@@ -1,9 +1,10 @@
 """Tests for usage service — record and query usage."""
 
+from unittest.mock import AsyncMock
+
 import pytest
 
 from vinzy_engine.common.config import VinzySettings
-from vinzy_engine.common.database import DatabaseManager
 from vinzy_engine.common.exceptions import LicenseNotFoundError
 from vinzy_engine.licensing.service import LicensingService
 from vinzy_engine.usage.service import UsageService
@@ -18,24 +19,19 @@ def make_settings(**overrides) -> VinzySettings:
     return VinzySettings(**defaults)
 
 
-@pytest.fixture
-async def db():
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
+@pytest.fixture(scope="module")
+def settings():
+    return make_settings()
 
 
-@pytest.fixture
-def licensing_svc():
-    return LicensingService(make_settings())
+@pytest.fixture(scope="module")
+def licensing_svc(settings):
+    return LicensingService(settings)
 
 
-@pytest.fixture
-def svc(licensing_svc):
-    return UsageService(make_settings(), licensing_svc)
+@pytest.fixture(scope="module")
+def svc(settings, licensing_svc):
+    return UsageService(settings, licensing_svc)
 
 
 async def _create_license(db, licensing_svc, entitlements=None):
@@ -99,6 +95,87 @@ class TestRecordUsage:
             assert result["remaining"] is None
 
 
+class TestRecordUsageMany:
+    async def test_inserts_all_values(self, db, svc, licensing_svc):
+        lic, raw_key = await _create_license(db, licensing_svc)
+        async with db.get_session() as session:
+            result = await svc.record_usage_many(
+                session, raw_key, "api-calls", [1.0, 2.0, 3.0],
+            )
+            assert result["value_added"] == 6.0
+            assert result["total_value"] == 6.0
+        async with db.get_session() as session:
+            summaries = await svc.get_usage_summary(session, lic.id)
+            assert summaries[0]["record_count"] == 3
+
+    async def test_applies_limit(self, db, svc, licensing_svc):
+        lic, raw_key = await _create_license(
+            db, licensing_svc, entitlements={"tokens": {"enabled": True, "limit": 10}},
+        )
+        async with db.get_session() as session:
+            result = await svc.record_usage_many(session, raw_key, "tokens", [4.0, 4.0])
+            assert result["limit"] == 10
+            assert result["remaining"] == 2.0
+
+    async def test_empty_values_records_nothing(self, db, svc, licensing_svc):
+        lic, raw_key = await _create_license(db, licensing_svc)
+        async with db.get_session() as session:
+            result = await svc.record_usage_many(session, raw_key, "api-calls", [])
+            assert result["value_added"] == 0.0
+            assert result["total_value"] == 0.0
+
+    async def test_invalid_key(self, db, svc):
+        async with db.get_session() as session:
+            with pytest.raises(LicenseNotFoundError):
+                await svc.record_usage_many(session, "bad-key", "api-calls", [1.0])
+
+
+class TestRecordUsageBatch:
+    async def test_groups_by_metric(self, db, svc, licensing_svc):
+        lic, raw_key = await _create_license(db, licensing_svc)
+        async with db.get_session() as session:
+            results = await svc.record_usage_batch(session, raw_key, [
+                {"metric": "tokens", "value": 10.0},
+                {"metric": "api-calls", "value": 1.0},
+                {"metric": "tokens", "value": 5.0, "metadata": {"agent": "CTO"}},
+            ])
+            assert [r["metric"] for r in results] == ["tokens", "api-calls"]
+            assert results[0]["value_added"] == 15.0
+            assert results[1]["total_value"] == 1.0
+        async with db.get_session() as session:
+            summaries = {s["metric"]: s for s in await svc.get_usage_summary(session, lic.id)}
+            assert summaries["tokens"]["record_count"] == 2
+
+    async def test_invalid_key(self, db, svc):
+        async with db.get_session() as session:
+            with pytest.raises(LicenseNotFoundError):
+                await svc.record_usage_batch(session, "bad-key", [{"metric": "m", "value": 1.0}])
+
+    async def test_emits_batch_events(self, db, settings, licensing_svc):
+        audit, anomaly, webhooks = AsyncMock(), AsyncMock(), AsyncMock()
+        batch_svc = UsageService(
+            settings, licensing_svc,
+            audit_service=audit, anomaly_service=anomaly, webhook_service=webhooks,
+        )
+        lic, raw_key = await _create_license(db, licensing_svc)
+        async with db.get_session() as session:
+            await batch_svc.record_usage_batch(session, raw_key, [
+                {"metric": "tokens", "value": 10.0},
+                {"metric": "tokens", "value": 2.0},
+                {"metric": "tokens", "value": 5.0},
+            ])
+        scanned = [c.args[3] for c in anomaly.scan_and_record.await_args_list]
+        assert scanned == [2.0, 10.0]
+        audit.record_event.assert_awaited_once_with(
+            session, lic.id, "usage.recorded_batch", "system",
+            {"metric": "tokens", "count": 3, "sum": 17.0},
+        )
+        webhooks.dispatch.assert_awaited_once_with(
+            session, "usage.recorded_batch",
+            {"license_id": lic.id, "metric": "tokens", "count": 3, "sum": 17.0},
+        )
+
+
 class TestUsageSummary:
     async def test_summary_empty(self, db, svc, licensing_svc):
         lic, raw_key = await _create_license(db, licensing_svc)
@@ -1,7 +1,5 @@
 """Tests for keygen.validator — offline format and HMAC validation."""
 
-import pytest
-
 from vinzy_engine.keygen.generator import generate_key
 from vinzy_engine.keygen.validator import validate_format, validate_key, validate_key_multi
 
@@ -6,14 +6,16 @@ import hmac
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from vinzy_engine.client import LicenseClient
 from vinzy_engine.common.config import VinzySettings
-from vinzy_engine.common.database import DatabaseManager
 from vinzy_engine.webhooks.service import (
     VALID_EVENT_TYPES,
     WebhookService,
+    _subscription_filter,
+    encode_payload,
     sign_payload,
 )
 
@@ -27,18 +29,23 @@ def make_settings(**overrides) -> VinzySettings:
 
 
 @pytest.fixture
-async def db():
-    settings = make_settings()
-    manager = DatabaseManager(settings)
-    await manager.init()
-    await manager.create_all()
-    yield manager
-    await manager.close()
+async def make_webhook_svc():
+    """Build WebhookServices from settings overrides; all are closed at teardown."""
+    services = []
+
+    def _make(**overrides) -> WebhookService:
+        svc = WebhookService(make_settings(**overrides))
+        services.append(svc)
+        return svc
+
+    yield _make
+    for svc in services:
+        await svc.close()
 
 
 @pytest.fixture
-def webhook_svc():
-    return WebhookService(make_settings())
+def webhook_svc(make_webhook_svc):
+    return make_webhook_svc()
 
 
 # ── HMAC Signing ──
@@ -75,6 +82,25 @@ class TestSignPayload:
         ).hexdigest()
         assert sign_payload(payload, secret) == expected
 
+    def test_bytes_and_str_payloads_match(self):
+        payload = encode_payload({"event_type": "license.created", "data": {}})
+        secret = "test-secret-12345678"
+        assert isinstance(payload, bytes)
+        assert sign_payload(payload, secret) == sign_payload(payload.decode(), secret)
+
+    def test_encode_payload_stdlib_fallback(self):
+        envelope = {"event_type": "license.created", "data": {"n": 1}}
+        with patch("vinzy_engine.webhooks.service.orjson", None):
+            raw = encode_payload(envelope)
+        assert isinstance(raw, bytes)
+        assert json.loads(raw) == json.loads(encode_payload(envelope))
+
+    @pytest.mark.parametrize("data", [{1: "int key"}, {"big": 2 ** 70}])
+    def test_encode_payload_handles_orjson_edge_cases(self, data):
+        envelope = {"event_type": "license.created", "data": data}
+        expected = json.loads(json.dumps(envelope))
+        assert json.loads(encode_payload(envelope)) == expected
+
 
 # ── SDK Verification ──
 
@@ -108,11 +134,11 @@ class TestSDKVerifySignature:
 
 
 class TestValidEventTypes:
-    def test_all_eight_types(self):
+    def test_all_event_types(self):
         expected = {
             "license.created", "license.updated", "license.deleted", "license.validated",
             "activation.created", "activation.removed",
-            "usage.recorded", "anomaly.detected",
+            "usage.recorded", "usage.recorded_batch", "anomaly.detected",
         }
         assert VALID_EVENT_TYPES == expected
 
@@ -280,6 +306,53 @@ class TestDispatch:
                 assert deliveries[0].event_type == "license.created"
                 assert deliveries[0].status == "pending"
 
+    async def test_dispatch_multiple_endpoints_single_flush(self, db, webhook_svc):
+        async with db.get_session() as session:
+            for i in range(3):
+                await webhook_svc.create_endpoint(
+                    session, url=f"https://example.com/hook-{i}",
+                    secret="secret-key-dispatch-test",
+                )
+        with patch.object(webhook_svc, "_fan_out") as mock_fan_out:
+            async with db.get_session() as session:
+                with patch.object(session, "flush", wraps=session.flush) as mock_flush:
+                    deliveries = await webhook_svc.dispatch(
+                        session, "license.created", {"license_id": "abc"},
+                    )
+                assert mock_flush.call_count == 1
+        assert len(deliveries) == 3
+        assert all(d.id for d in deliveries)
+        mock_fan_out.assert_called_once()
+        jobs = mock_fan_out.call_args.args[0]
+        assert len(jobs) == 3
+        # Every endpoint shares the same serialized envelope bytes.
+        assert len({id(job["payload_bytes"]) for job in jobs}) == 1
+
+    async def test_dispatch_sends_only_after_commit(self, db, webhook_svc):
+        async with db.get_session() as session:
+            await webhook_svc.create_endpoint(
+                session, url="https://example.com/hook",
+                secret="secret-key-after-commit",
+            )
+        with patch.object(webhook_svc, "_fan_out") as mock_fan_out:
+            async with db.get_session() as session:
+                await webhook_svc.dispatch(session, "license.created", {})
+                mock_fan_out.assert_not_called()
+            mock_fan_out.assert_called_once()
+
+    async def test_dispatch_rollback_drops_sends(self, db, webhook_svc):
+        async with db.get_session() as session:
+            await webhook_svc.create_endpoint(
+                session, url="https://example.com/hook",
+                secret="secret-key-after-commit",
+            )
+        with patch.object(webhook_svc, "_fan_out") as mock_fan_out:
+            with pytest.raises(RuntimeError):
+                async with db.get_session() as session:
+                    await webhook_svc.dispatch(session, "license.created", {})
+                    raise RuntimeError("abort")
+        mock_fan_out.assert_not_called()
+
     async def test_dispatch_skips_non_matching_event(self, db, webhook_svc):
         async with db.get_session() as session:
             await webhook_svc.create_endpoint(
@@ -294,6 +367,39 @@ class TestDispatch:
                 )
                 assert len(deliveries) == 0
 
+    async def test_dispatch_filters_subscriptions_in_sql(self, db, webhook_svc):
+        async with db.get_session() as session:
+            await webhook_svc.create_endpoint(
+                session, url="https://a.com/hook", secret="secret-key-sql-filter-a",
+                event_types=["license.created", "usage.recorded"],
+            )
+            await webhook_svc.create_endpoint(
+                session, url="https://b.com/hook", secret="secret-key-sql-filter-b",
+                event_types=["activation.created"],
+            )
+            await webhook_svc.create_endpoint(
+                session, url="https://c.com/hook", secret="secret-key-sql-filter-c",
+            )
+        with patch.object(webhook_svc, "_fan_out") as mock_fan_out:
+            async with db.get_session() as session:
+                deliveries = await webhook_svc.dispatch(session, "usage.recorded", {})
+        assert len(deliveries) == 2
+        urls = {job["url"] for job in mock_fan_out.call_args.args[0]}
+        assert urls == {"https://a.com/hook", "https://c.com/hook"}
+
+    async def test_dispatch_filters_in_python_without_json_support(self, db, webhook_svc):
+        async with db.get_session() as session:
+            await webhook_svc.create_endpoint(
+                session, url="https://a.com/hook", secret="secret-key-py-filter-a",
+                event_types=["license.created"],
+            )
+        with patch(
+            "vinzy_engine.webhooks.service._subscription_filter", return_value=None,
+        ), patch.object(webhook_svc, "_fan_out"):
+            async with db.get_session() as session:
+                assert await webhook_svc.dispatch(session, "usage.recorded", {}) == []
+                assert len(await webhook_svc.dispatch(session, "license.created", {})) == 1
+
     async def test_dispatch_wildcard_matches_all(self, db, webhook_svc):
         async with db.get_session() as session:
             await webhook_svc.create_endpoint(
@@ -308,6 +414,36 @@ class TestDispatch:
                 )
                 assert len(deliveries) == 1
 
+    @pytest.mark.parametrize("sql_filter", [True, False])
+    async def test_dispatch_null_event_types_matches_all(self, db, webhook_svc, sql_filter):
+        async with db.get_session() as session:
+            ep = await webhook_svc.create_endpoint(
+                session, url="https://example.com/hook",
+                secret="secret-key-dispatch-test",
+            )
+            ep.event_types = None  # stored as JSON null
+        with patch.object(webhook_svc, "_fan_out"):
+            async with db.get_session() as session:
+                if sql_filter:
+                    deliveries = await webhook_svc.dispatch(session, "usage.recorded", {})
+                else:
+                    with patch(
+                        "vinzy_engine.webhooks.service._subscription_filter",
+                        return_value=None,
+                    ):
+                        deliveries = await webhook_svc.dispatch(session, "usage.recorded", {})
+        assert len(deliveries) == 1
+
+    def test_postgres_filter_avoids_array_length_on_scalars(self):
+        from sqlalchemy.dialects import postgresql
+
+        sql = str(_subscription_filter("usage.recorded", "postgresql").compile(
+            dialect=postgresql.dialect(),
+        ))
+        assert "jsonb_array_length" not in sql
+        assert "IS NULL" in sql
+        assert "jsonb_typeof" in sql
+
     async def test_dispatch_skips_paused_endpoint(self, db, webhook_svc):
         async with db.get_session() as session:
             ep = await webhook_svc.create_endpoint(
@@ -355,7 +491,7 @@ class TestDeliveryLifecycle:
     async def test_successful_delivery(self, db, webhook_svc):
         """Mock a successful HTTP POST and verify delivery status updates."""
         async with db.get_session() as session:
-            ep = await webhook_svc.create_endpoint(
+            await webhook_svc.create_endpoint(
                 session, url="https://example.com/hook",
                 secret="secret-key-delivery-test",
                 event_types=["license.created"],
@@ -374,7 +510,8 @@ class TestDeliveryLifecycle:
                 delivery_id="test-delivery-id",
                 url="https://example.com/hook",
                 secret="secret-key-delivery-test",
-                payload={"event_type": "license.created", "data": {}},
+                payload_bytes=encode_payload({"event_type": "license.created", "data": {}}),
+                event_type="license.created",
                 max_retries=3,
                 timeout=10,
             )
@@ -395,7 +532,8 @@ class TestDeliveryLifecycle:
                 delivery_id="test-delivery-id",
                 url="https://example.com/hook",
                 secret="secret-key-delivery-test",
-                payload={"event_type": "license.created", "data": {}},
+                payload_bytes=encode_payload({"event_type": "license.created", "data": {}}),
+                event_type="license.created",
                 max_retries=1,
                 timeout=10,
             )
@@ -403,6 +541,210 @@ class TestDeliveryLifecycle:
                 "test-delivery-id", "failed", 2, 500, "HTTP 500",
             )
 
+    @pytest.mark.parametrize("status_code", [400, 401, 404, 410])
+    async def test_client_error_fails_without_retry(self, webhook_svc, status_code):
+        mock_response = MagicMock()
+        mock_response.status_code = status_code
+
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        webhook_svc._http_client = mock_client
+
+        with patch.object(webhook_svc, "_update_delivery_status", new_callable=AsyncMock) as mock_update, \
+                patch("vinzy_engine.webhooks.service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await webhook_svc._send_delivery(
+                delivery_id="test-delivery-id",
+                url="https://example.com/hook",
+                secret="secret-key-delivery-test",
+                payload_bytes=b"{}",
+                event_type="license.created",
+                max_retries=3,
+                timeout=10,
+            )
+            assert mock_client.post.await_count == 1
+            mock_sleep.assert_not_called()
+            mock_update.assert_called_once_with(
+                "test-delivery-id", "failed", 1, status_code, f"HTTP {status_code}",
+            )
+
+    @pytest.mark.parametrize("status_code", [408, 425, 429, 503])
+    async def test_retryable_status_is_retried(self, webhook_svc, status_code):
+        mock_response = MagicMock()
+        mock_response.status_code = status_code
+
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        webhook_svc._http_client = mock_client
+
+        with patch.object(webhook_svc, "_update_delivery_status", new_callable=AsyncMock) as mock_update, \
+                patch("vinzy_engine.webhooks.service.asyncio.sleep", new_callable=AsyncMock):
+            await webhook_svc._send_delivery(
+                delivery_id="test-delivery-id",
+                url="https://example.com/hook",
+                secret="secret-key-delivery-test",
+                payload_bytes=b"{}",
+                event_type="license.created",
+                max_retries=2,
+                timeout=10,
+            )
+            assert mock_client.post.await_count == 3
+            mock_update.assert_called_once_with(
+                "test-delivery-id", "failed", 3, status_code, f"HTTP {status_code}",
+            )
+
+    async def test_unsupported_protocol_fails_without_retry(self, webhook_svc):
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(
+            side_effect=httpx.UnsupportedProtocol("Request URL has an unsupported protocol"),
+        )
+        webhook_svc._http_client = mock_client
+
+        with patch.object(webhook_svc, "_update_delivery_status", new_callable=AsyncMock) as mock_update:
+            await webhook_svc._send_delivery(
+                delivery_id="test-delivery-id",
+                url="ftp://example.com/hook",
+                secret="secret-key-delivery-test",
+                payload_bytes=b"{}",
+                event_type="license.created",
+                max_retries=3,
+                timeout=10,
+            )
+            assert mock_client.post.await_count == 1
+            mock_update.assert_called_once_with(
+                "test-delivery-id", "failed", 1, None,
+                "Request URL has an unsupported protocol",
+            )
+
+
+class TestUpdateDeliveryStatus:
+    async def _make_delivery(self, db, webhook_svc):
+        async with db.get_session() as session:
+            await webhook_svc.create_endpoint(
+                session, url="https://example.com/hook",
+                secret="secret-key-status-tests",
+            )
+        with patch.object(webhook_svc, "_fan_out"):
+            async with db.get_session() as session:
+                deliveries = await webhook_svc.dispatch(session, "license.created", {})
+        return deliveries[0].id
+
+    async def test_marks_success(self, db, webhook_svc):
+        delivery_id = await self._make_delivery(db, webhook_svc)
+        with patch("vinzy_engine.deps.get_db", return_value=db):
+            await webhook_svc._update_delivery_status(delivery_id, "success", 1, 200, None)
+            await webhook_svc._flush_status_updates()
+        async with db.get_session() as session:
+            delivery = await webhook_svc.get_delivery(session, delivery_id)
+            assert delivery.status == "success"
+            assert delivery.attempts == 1
+            assert delivery.last_response_code == 200
+            assert delivery.next_retry_at is None
+
+    async def test_failed_schedules_retry(self, db, webhook_svc):
+        delivery_id = await self._make_delivery(db, webhook_svc)
+        with patch("vinzy_engine.deps.get_db", return_value=db):
+            await webhook_svc._update_delivery_status(
+                delivery_id, "failed", 4, 503, "HTTP 503",
+            )
+            await webhook_svc._flush_status_updates()
+        async with db.get_session() as session:
+            delivery = await webhook_svc.get_delivery(session, delivery_id)
+            assert delivery.status == "failed"
+            assert delivery.last_error == "HTTP 503"
+            assert delivery.next_retry_at is not None
+
+    async def test_missing_delivery_is_noop(self, db, webhook_svc):
+        with patch("vinzy_engine.deps.get_db", return_value=db):
+            await webhook_svc._update_delivery_status("fake-id", "success", 1, 200, None)
+            await webhook_svc._flush_status_updates()
+
+    async def test_updates_are_written_in_one_batch(self, db, webhook_svc):
+        first = await self._make_delivery(db, webhook_svc)
+        second = await self._make_delivery(db, webhook_svc)
+        with patch("vinzy_engine.deps.get_db", return_value=db), \
+                patch.object(
+                    webhook_svc, "_write_status_batch",
+                    wraps=webhook_svc._write_status_batch,
+                ) as mock_write:
+            await webhook_svc._update_delivery_status(first, "failed", 1, 500, "HTTP 500")
+            await webhook_svc._update_delivery_status(second, "success", 1, 200, None)
+            await webhook_svc._update_delivery_status(first, "success", 2, 200, None)
+            await webhook_svc._flush_status_updates()
+        mock_write.assert_called_once()
+        async with db.get_session() as session:
+            for delivery_id, attempts in ((first, 2), (second, 1)):
+                delivery = await webhook_svc.get_delivery(session, delivery_id)
+                assert delivery.status == "success"
+                assert delivery.attempts == attempts
+
+
+# ── Shared HTTP Client ──
+
+
+class TestHttpClient:
+    async def test_client_is_shared_and_pooled(self, webhook_svc):
+        client = webhook_svc._http_client
+        assert isinstance(client, httpx.AsyncClient)
+        pool = client._transport._pool
+        assert pool._max_connections == 200
+        assert pool._max_keepalive_connections == 100
+        await webhook_svc.close()
+        assert client.is_closed
+
+
+# ── Delivery Queue ──
+
+
+class TestDeliveryQueue:
+    async def test_concurrency_is_bounded(self, make_webhook_svc):
+        svc = make_webhook_svc(webhook_concurrency=2)
+        in_flight = 0
+        peak = 0
+
+        async def fake_send(**job):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        with patch.object(svc, "_send_delivery", side_effect=fake_send) as mock_send:
+            svc._fan_out([{"delivery_id": f"d-{i}"} for i in range(6)])
+            await svc._get_queue().join()
+
+        assert mock_send.call_count == 6
+        assert peak == 2
+
+    async def test_worker_survives_failed_send(self, make_webhook_svc):
+        svc = make_webhook_svc(webhook_concurrency=1)
+        with patch.object(
+            svc, "_send_delivery", side_effect=[RuntimeError("boom"), None],
+        ) as mock_send:
+            svc._fan_out([{"delivery_id": "d-1"}, {"delivery_id": "d-2"}])
+            await svc._get_queue().join()
+        assert mock_send.call_count == 2
+
+    async def test_queue_overflow_is_marked_failed(self, make_webhook_svc):
+        svc = make_webhook_svc(webhook_concurrency=1, webhook_queue_size=2)
+        release = asyncio.Event()
+
+        async def fake_send(**job):
+            await release.wait()
+
+        with patch.object(svc, "_send_delivery", side_effect=fake_send) as mock_send, \
+                patch.object(svc, "_queue_status_update") as mock_status:
+            svc._fan_out([{"delivery_id": f"d-{i}"} for i in range(5)])
+            assert svc._get_queue().qsize() == 2
+            svc._fan_out([{"delivery_id": "d-5"}])
+            assert svc._get_queue().qsize() == 2
+            release.set()
+            await svc._get_queue().join()
+
+        assert mock_send.call_count == 2
+        failed = [c.args[0] for c in mock_status.call_args_list]
+        assert failed == ["d-2", "d-3", "d-4", "d-5"]
+        assert all(c.args[1] == "failed" for c in mock_status.call_args_list)
+
 
 # ── Delivery Queries ──
 
@@ -428,7 +770,7 @@ class TestDeliveryQueries:
 
     async def test_retry_delivery(self, db, webhook_svc):
         async with db.get_session() as session:
-            ep = await webhook_svc.create_endpoint(
+            await webhook_svc.create_endpoint(
                 session, url="https://example.com/hook",
                 secret="secret-key-retry-tests",
                 event_types=["license.created"],
@@ -440,13 +782,13 @@ class TestDeliveryQueries:
                 )
                 delivery_id = deliveries[0].id
 
-        with patch.object(webhook_svc, "_send_delivery", new_callable=AsyncMock) as mock_send:
+        with patch.object(webhook_svc, "_fan_out") as mock_fan_out:
             async with db.get_session() as session:
                 retried = await webhook_svc.retry_delivery(session, delivery_id)
                 assert retried is not None
                 assert retried.status == "pending"
                 assert retried.attempts == 0
-                mock_send.assert_called_once()
+            mock_fan_out.assert_called_once()
 
     async def test_retry_nonexistent_returns_none(self, db, webhook_svc):
         async with db.get_session() as session: